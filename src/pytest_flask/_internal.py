@@ -1,13 +1,104 @@
 import functools
+import itertools
+import math
 import warnings
+from typing import Any
 from typing import Callable
+from typing import Dict
+from typing import List
 from typing import Literal
+from typing import Tuple
 
+import pytest
 from pytest import Config as _PytestConfig
 
 
 _PytestScopeName = Literal["session", "package", "module", "class", "function"]
 
+_DEFAULT_MIMETYPES = ("application/json", "text/html")
+
+#: Access log modes of the live server.
+_ACCESS_LOG_MODES = ("stderr", "capture", "off")
+
+#: Live servers started during the session.
+_live_servers_key = pytest.StashKey[list]()
+
+#: ``workerinput`` key of the lifecycle records of the live servers started
+#: by a pytest-xdist worker, and the records of the whole session.
+_LIVE_SERVER_RECORDS = "pytest_flask_live_servers"
+_live_server_records_key = pytest.StashKey[List[Dict[str, Any]]]()
+
+#: Startup durations of the live servers of each application in previous
+#: sessions, in the pytest cache.
+_STARTUP_CACHE_KEY = "pytest_flask/live_server_startup"
+
+#: Startup durations kept per application, and needed to adapt the wait.
+_STARTUP_HISTORY_SIZE = 50
+_ADAPTIVE_WAIT_SAMPLES = 5
+
+#: The adaptive wait is this many times the 95th percentile of startup
+#: durations, and at least ``_ADAPTIVE_WAIT_MIN`` seconds.
+_ADAPTIVE_WAIT_FACTOR = 3
+_ADAPTIVE_WAIT_MIN = 1.0
+
+#: Recorded responses replayed by the ``client`` fixture.
+_replay_cache_key = pytest.StashKey[Any]()
+
+_REPLAY_MODES = ("off", "on", "verify")
+
+#: Jinja environments whose templates were compiled with
+#: ``--flask-template-cache``.
+_compiled_templates_key = pytest.StashKey[Any]()
+
+#: Allocation tracker of the ``client`` fixture of a test.
+_allocation_tracker_key = pytest.StashKey[Any]()
+
+#: ``[requests, max peak, max net, test of max peak]`` per endpoint of the
+#: requests traced with ``--flask-allocations``.
+_flask_allocations_key = pytest.StashKey[Dict[Any, List[Any]]]()
+
+#: The virtual clock of the session.
+_virtual_clock_key = pytest.StashKey[Any]()
+
+#: Whether a collected test uses the ``virtual_clock`` fixture, otherwise
+#: live servers are started without the virtual clock.
+_virtual_clock_used_key = pytest.StashKey[bool]()
+
+#: ``workerinput`` key of the directory of the live servers shared by the
+#: pytest-xdist workers.
+_SHARED_DIR_KEY = "pytest_flask_shared_dir"
+_shared_dir_key = pytest.StashKey[str]()
+
+#: ``workerinput`` key of the temporary directory where the live servers of
+#: the session write their profiling stats, merged at the end of the session.
+_PROFILE_DIR_KEY = "pytest_flask_profile_dir"
+_profile_dir_key = pytest.StashKey[str]()
+
+#: Fixtures whose setup is timed with ``--flask-durations``.
+_TIMED_FIXTURES = frozenset(
+    (
+        "app",
+        "_compile_templates",
+        "_monkeypatch_response_class",
+        "_push_request_context",
+        "_configure_application",
+        "_track_live_server",
+        "client",
+        "client_class",
+        "streaming_client",
+        "live_server",
+        "live_servers",
+        "live_load",
+        "accept_matrix",
+    )
+)
+
+#: Times the fixtures of the test being set up.
+_setup_timer_key = pytest.StashKey[Any]()
+
+#: ``(nodeid, fixture, duration)`` of every timed fixture setup.
+_flask_durations_key = pytest.StashKey[List[Tuple[str, str, float]]]()
+
 
 def deprecated(reason: str) -> Callable:
     """Decorator which can be used to mark function or method as deprecated.
@@ -34,9 +125,56 @@ def _rewrite_server_name(server_name: str, new_port: str) -> str:
     return sep.join((server_name, new_port))
 
 
+def _startup_history_key(app: Any, backend: str) -> str:
+    return "{}:{}".format(getattr(app, "import_name", type(app).__name__), backend)
+
+
+def _adaptive_wait(history: List[float], wait: float) -> float:
+    """Derive the live server wait timeout from the ``history`` of startup
+    durations of the application, bounded by ``wait``. Returns ``wait`` until
+    there are enough startup durations."""
+    if len(history) < _ADAPTIVE_WAIT_SAMPLES:
+        return wait
+    durations = sorted(history)
+    p95 = durations[math.ceil(0.95 * len(durations)) - 1]
+    return min(wait, max(_ADAPTIVE_WAIT_MIN, _ADAPTIVE_WAIT_FACTOR * p95))
+
+
 def _determine_scope(*, fixture_name: str, config: _PytestConfig) -> _PytestScopeName:
     return config.getini("live_server_scope")
 
 
 def _make_accept_header(mimetype):
     return [("Accept", mimetype)]
+
+
+@functools.lru_cache(maxsize=None)
+def _make_accept_matrix(
+    mimetypes: Tuple[str, ...],
+    charsets: Tuple[str, ...] = (),
+    encodings: Tuple[str, ...] = (),
+) -> List[Tuple[Tuple[str, str], ...]]:
+    """Build every combination of ``Accept``, ``Accept-Charset`` and
+    ``Accept-Encoding`` headers. Results are cached, so the matrix is only
+    generated once per distinct set of arguments."""
+    axes = [
+        [("Accept", value) for value in mimetypes],
+        [("Accept-Charset", value) for value in charsets],
+        [("Accept-Encoding", value) for value in encodings],
+    ]
+    return list(itertools.product(*(axis for axis in axes if axis)))
+
+
+def _accept_matrix_options(marker) -> Tuple[Tuple[str, ...], ...]:
+    """Read ``mimetypes``, ``charsets`` and ``encodings`` from the
+    ``accept_matrix`` marker, if any."""
+    kwargs = marker.kwargs if marker is not None else {}
+    return (
+        tuple(kwargs.get("mimetypes", _DEFAULT_MIMETYPES)),
+        tuple(kwargs.get("charsets", ())),
+        tuple(kwargs.get("encodings", ())),
+    )
+
+
+def _accept_matrix_id(headers) -> str:
+    return "-".join(value for _, value in headers)
@@ -0,0 +1,142 @@
+import tracemalloc
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+from typing import Tuple
+from typing import Union
+
+import pytest
+
+# Allocations of the tracing machinery itself
+_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+
+class RequestAllocations(NamedTuple):
+    """The memory allocated while the application handled a request.
+
+    ``peak`` is the largest amount of memory allocated at once during the
+    request and ``net`` the amount still allocated after it, in bytes.
+    ``top`` lists the ``"file:line"`` sites allocating most of the memory
+    still allocated after the request, with their size in bytes.
+    """
+
+    method: str
+    path: str
+    endpoint: Union[str, None]
+    peak: int
+    net: int
+    top: List[Tuple[str, int]]
+
+    def format(self) -> str:
+        lines = [
+            f"{self.method} {self.path} ({self.endpoint}): "
+            f"peak {self.peak} bytes, net {self.net:+d} bytes"
+        ]
+        lines.extend(f"  {size:>10} bytes  {site}" for site, size in self.top)
+        return "\n".join(lines)
+
+
+class AllocationTracker:
+    """Makes the ``open`` method of a Flask test client trace the memory
+    allocated by each request with :mod:`tracemalloc`.
+
+    Tracing slows down the application, and only covers the response body
+    when it is not streamed or the request is ``buffered``.
+
+    :param client: The Flask test client.
+    :param top: The number of allocation sites recorded per request.
+    """
+
+    def __init__(self, client: Any, top: int = 10):
+        self.client = client
+        self.top = top
+        #: The allocations of every request, in order.
+        self.records: List[RequestAllocations] = []
+        self._open = client.open
+        client.open = self.open
+
+    def open(self, *args: Any, **kwargs: Any) -> Any:
+        from flask import request
+        from flask import request_started
+
+        endpoints: List[Union[str, None]] = []
+
+        def observe(sender: Any, **extra: Any) -> None:
+            endpoints.append(request.endpoint)
+
+        app = self.client.application
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+            before = None
+        else:
+            before = tracemalloc.take_snapshot()
+            if hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+        request_started.connect(observe, app)
+        try:
+            response = self._open(*args, **kwargs)
+            end, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot()
+        finally:
+            request_started.disconnect(observe, app)
+            if started:
+                tracemalloc.stop()
+
+        after = after.filter_traces(_FILTERS)
+        if before is None:
+            stats = after.statistics("lineno")
+            top = [(str(stat.traceback), stat.size) for stat in stats]
+        else:
+            diff = after.compare_to(before.filter_traces(_FILTERS), "lineno")
+            top = [(str(stat.traceback), stat.size_diff) for stat in diff]
+            top.sort(key=lambda site: site[1], reverse=True)
+
+        environ = response.request.environ
+        self.records.append(
+            RequestAllocations(
+                environ["REQUEST_METHOD"],
+                environ.get("PATH_INFO", "/"),
+                endpoints[0] if endpoints else None,
+                max(peak - current, end - current, 0),
+                end - current,
+                [site for site in top[: self.top] if site[1] > 0],
+            )
+        )
+        return response
+
+    def by_endpoint(self) -> Dict[Union[str, None], List[RequestAllocations]]:
+        """Return the allocations of requests grouped by endpoint."""
+        grouped: Dict[Union[str, None], List[RequestAllocations]] = {}
+        for record in self.records:
+            grouped.setdefault(record.endpoint, []).append(record)
+        return grouped
+
+    def assert_max(
+        self,
+        peak: Union[int, None] = None,
+        net: Union[int, None] = None,
+        endpoint: Union[str, None] = None,
+    ) -> None:
+        """Fail the test if a request, to ``endpoint`` if given, allocated
+        more than ``peak`` bytes at once or left more than ``net`` bytes
+        allocated."""
+        records = self.records
+        if endpoint is not None:
+            records = [record for record in records if record.endpoint == endpoint]
+        for record in records:
+            if peak is not None and record.peak > peak:
+                pytest.fail(f"Peak allocation above {peak} bytes:\n{record.format()}")
+            if net is not None and record.net > net:
+                pytest.fail(f"Net allocation above {net} bytes:\n{record.format()}")
+
+    def __repr__(self):
+        return "<AllocationTracker %d requests>" % len(self.records)
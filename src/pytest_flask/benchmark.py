@@ -0,0 +1,338 @@
+import gc
+import hashlib
+import http.client
+import json
+import math
+import platform
+import statistics
+import time
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import Union
+
+import pytest
+
+
+class BenchmarkResult:
+    """The timings of a request measured by :class:`FlaskBenchmark`.
+
+    :param name: The name of the benchmark.
+    :param timings: The mean duration of a request in each round, in seconds.
+    :param iterations: The number of requests per round.
+    :param baseline: The median of the saved baseline, if any.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        timings: List[float],
+        iterations: int,
+        baseline: Union[float, None] = None,
+    ):
+        self.name = name
+        self.timings = timings
+        self.iterations = iterations
+        self.baseline = baseline
+
+    @property
+    def rounds(self) -> int:
+        return len(self.timings)
+
+    @property
+    def min(self) -> float:
+        return min(self.timings)
+
+    @property
+    def max(self) -> float:
+        return max(self.timings)
+
+    @property
+    def mean(self) -> float:
+        return statistics.mean(self.timings)
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.timings)
+
+    @property
+    def stddev(self) -> float:
+        return statistics.stdev(self.timings) if len(self.timings) > 1 else 0.0
+
+    @property
+    def ops(self) -> float:
+        """Requests per second."""
+        return 1 / self.mean if self.mean else math.inf
+
+    @property
+    def change(self) -> Union[float, None]:
+        """The relative change of the median from the baseline, if any."""
+        if not self.baseline:
+            return None
+        return self.median / self.baseline - 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "rounds": self.rounds,
+            "iterations": self.iterations,
+            "min": self.min,
+            "max": self.max,
+            "mean": self.mean,
+            "median": self.median,
+            "stddev": self.stddev,
+            "ops": self.ops,
+            "baseline": self.baseline,
+        }
+
+    def __repr__(self):
+        return "<BenchmarkResult %s: median=%.6fs over %d rounds of %d>" % (
+            self.name,
+            self.median,
+            self.rounds,
+            self.iterations,
+        )
+
+
+class BenchmarkStore:
+    """Results and baselines of benchmarks, kept in the pytest cache
+    directory, if available.
+
+    :param save_baseline: Whether results are also saved as the baseline.
+    """
+
+    def __init__(self, cache: Any = None, save_baseline: bool = False):
+        self.cache = cache
+        self.save_baseline = save_baseline
+
+    @staticmethod
+    def key(nodeid: str, name: str) -> str:
+        return hashlib.sha256(f"{nodeid}::{name}".encode()).hexdigest()
+
+    def baseline(self, key: str) -> Union[Dict[str, Any], None]:
+        if self.cache is None:
+            return None
+        return self.cache.get(f"pytest_flask/benchmark_baseline/{key}", None)
+
+    def save(self, key: str, result: BenchmarkResult) -> None:
+        if self.cache is None:
+            return
+        self.cache.set(f"pytest_flask/benchmark/{key}", result.as_dict())
+        if self.save_baseline:
+            self.cache.set(f"pytest_flask/benchmark_baseline/{key}", result.as_dict())
+
+
+class FlaskBenchmark:
+    """Time requests to the application, through a test client or to the
+    live server if ``live_server`` is given.
+
+    Each benchmark is calibrated so that a round of requests lasts at least
+    ``min_time``, then runs rounds until ``max_time`` is spent, with at
+    least ``min_rounds`` of them. The result is compared with the saved
+    baseline: the test fails if the median is slower by more than
+    ``tolerance`` (a fraction, e.g. ``0.2`` for 20%).
+
+    :param client: A Flask test client.
+    :param store: Where results are saved and baselines read.
+    :param nodeid: The node ID of the test, which identifies its results.
+    :param live_server: The live server to send requests to, if any.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        store: BenchmarkStore,
+        nodeid: str,
+        live_server: Any = None,
+        tolerance: Union[float, None] = None,
+        min_rounds: int = 5,
+        max_rounds: int = 1000,
+        min_time: float = 0.001,
+        max_time: float = 1.0,
+        warmup: int = 1,
+        disable_gc: bool = False,
+        timer: Callable[[], float] = time.perf_counter,
+    ):
+        self.client = client
+        self.store = store
+        self.nodeid = nodeid
+        self.live_server = live_server
+        self.tolerance = tolerance
+        self.min_rounds = min_rounds
+        self.max_rounds = max_rounds
+        self.min_time = min_time
+        self.max_time = max_time
+        self.warmup = warmup
+        self.disable_gc = disable_gc
+        self.timer = timer
+        #: The results of the benchmarks run by the test.
+        self.results: List[BenchmarkResult] = []
+
+    def __call__(self, *args: Any, name: str = "", **kwargs: Any) -> Any:
+        """Benchmark a request. Arguments are the same as for
+        :meth:`flask.testing.FlaskClient.open`.
+
+        :param name: Distinguishes the benchmarks of a test.
+        :return: The response to the last request.
+        """
+        name = name or self.nodeid.rpartition("::")[2]
+        if any(result.name == name for result in self.results):
+            raise ValueError(f"Benchmark {name!r} already run by this test.")
+
+        send, close = self._prepare(args, kwargs)
+        try:
+            for _ in range(self.warmup):
+                send()
+            iterations, duration = self._calibrate(send)
+            rounds = math.ceil(self.max_time / duration) if duration else 0
+            rounds = min(max(rounds, self.min_rounds), self.max_rounds)
+            timings = []
+            for _ in range(rounds):
+                duration, response = self._round(send, iterations)
+                timings.append(duration / iterations)
+        finally:
+            close()
+
+        key = self.store.key(self.nodeid, name)
+        baseline = None if self.store.save_baseline else self.store.baseline(key)
+        result = BenchmarkResult(
+            name, timings, iterations, baseline["median"] if baseline else None
+        )
+        self.results.append(result)
+        self.store.save(key, result)
+
+        change = result.change
+        if self.tolerance is not None and change is not None:
+            if change > self.tolerance:
+                pytest.fail(
+                    f"Benchmark {name!r} is {change:.1%} slower than its baseline "
+                    f"(median {result.median:.6f}s vs {result.baseline:.6f}s, "
+                    f"tolerance {self.tolerance:.0%})."
+                )
+        return response
+
+    def _calibrate(self, send: Callable[[], Any]) -> Tuple[int, float]:
+        """Return the number of requests per round needed for a round to last
+        at least ``min_time``, and the duration of such a round."""
+        iterations = 1
+        while True:
+            duration, _ = self._round(send, iterations)
+            if duration >= self.min_time or iterations >= 1_000_000:
+                return iterations, duration
+            if duration > 0:
+                iterations *= max(2, math.ceil(self.min_time / duration))
+            else:
+                iterations *= 10
+
+    def _round(self, send: Callable[[], Any], iterations: int) -> Tuple[float, Any]:
+        gc_enabled = gc.isenabled()
+        if self.disable_gc:
+            gc.collect()
+            gc.disable()
+        try:
+            start = self.timer()
+            for _ in range(iterations):
+                response = send()
+            return self.timer() - start, response
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    def _prepare(
+        self, args: Tuple[Any, ...], kwargs: Dict[str, Any]
+    ) -> Tuple[Callable[[], Any], Callable[[], None]]:
+        """Return functions sending the request and releasing its
+        resources."""
+        if self.live_server is None:
+            kwargs.setdefault("buffered", True)
+            return lambda: self.client.open(*args, **kwargs), lambda: None
+
+        from .concurrency import _http_request
+        from .concurrency import _make_builder
+
+        app = self.live_server.app
+        builder = _make_builder(app, (args, kwargs))
+        try:
+            method, path, body, headers = _http_request(builder)
+        finally:
+            builder.close()
+        conn = http.client.HTTPConnection(self.live_server.host, self.live_server.port)
+
+        def send() -> Any:
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            data = response.read()
+            if response.will_close:
+                conn.close()
+            return app.response_class(
+                data, status=response.status, headers=response.getheaders()
+            )
+
+        return send, conn.close
+
+    def __repr__(self):
+        return "<FlaskBenchmark %d results>" % len(self.results)
+
+
+def _format_seconds(seconds: float) -> str:
+    if seconds < 0.001:
+        return f"{seconds * 1e6:.1f}us"
+    if seconds < 1:
+        return f"{seconds * 1e3:.2f}ms"
+    return f"{seconds:.2f}s"
+
+
+class BenchmarkReport:
+    """Plugin collecting the results of ``flask_benchmark`` from test
+    reports, also sent by pytest-xdist workers, to show them in the terminal
+    summary and write them to ``--flask-benchmark-json``."""
+
+    def __init__(self, config: Any):
+        self.config = config
+        #: The results, with the node ID of their test.
+        self.results: List[Dict[str, Any]] = []
+
+    def pytest_runtest_logreport(self, report: Any) -> None:
+        if report.when != "teardown":
+            return
+        for name, value in report.user_properties:
+            if name == "flask_benchmark":
+                self.results.extend(
+                    dict(result, nodeid=report.nodeid) for result in value
+                )
+
+    def pytest_sessionfinish(self) -> None:
+        path = self.config.getvalue("flask_benchmark_json")
+        if path is None:
+            return
+        data = {
+            "datetime": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "benchmarks": self.results,
+        }
+        with open(self.config.invocation_params.dir / path, "w") as f:
+            json.dump(data, f, indent=2)
+
+    def pytest_terminal_summary(self, terminalreporter: Any) -> None:
+        if not self.results:
+            return
+        terminalreporter.write_sep("=", "flask benchmarks")
+        terminalreporter.write_line(
+            f"{'median':>10} {'mean':>10} {'stddev':>10} {'rounds':>7} "
+            f"{'baseline':>9}  name"
+        )
+        for result in self.results:
+            change = ""
+            if result["baseline"]:
+                change = f"{result['median'] / result['baseline'] - 1:+.1%}"
+            name = result["nodeid"]
+            if not name.endswith(f"::{result['name']}"):
+                name = f"{name} ({result['name']})"
+            terminalreporter.write_line(
+                f"{_format_seconds(result['median']):>10} "
+                f"{_format_seconds(result['mean']):>10} "
+                f"{_format_seconds(result['stddev']):>10} "
+                f"{result['rounds']:>7} {change:>9}  {name}"
+            )
@@ -0,0 +1,87 @@
+import multiprocessing
+import time
+from typing import Any
+
+_real_time = time.time
+_real_time_ns = time.time_ns
+_real_monotonic = time.monotonic
+_real_monotonic_ns = time.monotonic_ns
+_real_sleep = time.sleep
+
+
+class VirtualClock:
+    """A clock shared by the test process and the live server processes,
+    which can be moved forward instantly once enabled.
+
+    When enabled, ``time.time()``, ``time.monotonic()`` and their ``_ns``
+    variants return the real time plus an offset, and ``time.sleep()`` adds
+    to the offset instead of sleeping, in every process where the clock is
+    installed.
+    """
+
+    def __init__(self):
+        # Forked live servers share the memory of the enabled flag and of the
+        # offset (in seconds)
+        self._state = multiprocessing.Array("d", 2)
+        self._values: Any = self._state.get_obj()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._values[0])
+
+    @property
+    def offset(self) -> float:
+        """How far (in seconds) the clock has been moved forward."""
+        return self._values[1]
+
+    def enable(self) -> None:
+        with self._state.get_lock():
+            self._values[0] = 1.0
+            self._values[1] = 0.0
+
+    def disable(self) -> None:
+        """Go back to the real time."""
+        with self._state.get_lock():
+            self._values[0] = 0.0
+            self._values[1] = 0.0
+
+    def advance(self, seconds: float) -> None:
+        """Move the clock forward by ``seconds``."""
+        if seconds < 0:
+            raise ValueError("the clock can't go backwards")
+        with self._state.get_lock():
+            self._values[1] += seconds
+
+    def time(self) -> float:
+        return _real_time() + self._offset()
+
+    def time_ns(self) -> int:
+        return _real_time_ns() + int(self._offset() * 1e9)
+
+    def monotonic(self) -> float:
+        return _real_monotonic() + self._offset()
+
+    def monotonic_ns(self) -> int:
+        return _real_monotonic_ns() + int(self._offset() * 1e9)
+
+    def sleep(self, seconds: float) -> None:
+        if self._values[0]:
+            self.advance(seconds)
+        else:
+            _real_sleep(seconds)
+
+    def _offset(self) -> float:
+        return self._values[1] if self._values[0] else 0.0
+
+    def install(self, monkeypatch: Any = None) -> None:
+        """Replace the functions of the :mod:`time` module with the ones of
+        the clock, with ``monkeypatch`` if given."""
+        setattr_ = monkeypatch.setattr if monkeypatch is not None else setattr
+        for name in ("time", "time_ns", "monotonic", "monotonic_ns", "sleep"):
+            setattr_(time, name, getattr(self, name))
+
+    def __repr__(self):
+        return "<VirtualClock %s, offset %.3fs>" % (
+            "enabled" if self.enabled else "disabled",
+            self.offset,
+        )
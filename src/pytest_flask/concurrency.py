@@ -0,0 +1,170 @@
+import http.client
+import threading
+import time
+from typing import Any
+from typing import cast
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+from typing import Sequence
+from typing import Tuple
+from typing import Union
+
+from flask.testing import EnvironBuilder
+
+
+class ConcurrentResult(NamedTuple):
+    """The response to one of the requests of :meth:`ConcurrentClient.map`,
+    with its start time relative to the release of the requests and its
+    duration, in seconds."""
+
+    response: Any
+    started: float
+    duration: float
+
+
+class ConcurrentClient:
+    """Send requests to the application from several threads released at
+    the same time by a barrier, to test views for race conditions.
+
+    Requests are sent through a test client per thread, or to the live
+    server if ``live_server`` is given. Live server responses are instances
+    of ``app.response_class``, so they are tested like test client responses.
+
+    :param app: The application.
+    :param live_server: The live server to send requests to, if any.
+    :param timeout: The timeout (in seconds) of the barrier and of live
+                    server requests.
+    """
+
+    def __init__(self, app: Any, live_server: Any = None, timeout: float = 5):
+        self.app = app
+        self.live_server = live_server
+        self.timeout = timeout
+
+    def run(self, count: int, *args: Any, **kwargs: Any) -> List[ConcurrentResult]:
+        """Send the same request from ``count`` threads at the same time.
+        Arguments are the same as for :class:`flask.testing.EnvironBuilder`.
+        """
+        return self.map([(args, kwargs)] * count)
+
+    def map(
+        self, requests: Sequence[Union[str, Dict[str, Any], Any]]
+    ) -> List[ConcurrentResult]:
+        """Send ``requests`` from a thread each, at the same time.
+
+        :param requests: Paths, dicts of keyword arguments, or
+                         ``(args, kwargs)`` pairs of arguments for
+                         :class:`flask.testing.EnvironBuilder`.
+        :return: The results, in the order of ``requests``.
+
+        An exception raised while preparing or sending a request is raised
+        again, and :class:`TimeoutError` is raised if the threads weren't
+        all ready to send their request within the timeout.
+        """
+        builders = [_make_builder(self.app, request) for request in requests]
+        release_time = 0.0
+
+        def release() -> None:
+            nonlocal release_time
+            release_time = time.perf_counter()
+
+        barrier = threading.Barrier(
+            len(builders) + 1, action=release, timeout=self.timeout
+        )
+        results: List[Union[ConcurrentResult, None]] = [None] * len(builders)
+        errors: List[Exception] = []
+
+        def worker(index: int, builder: EnvironBuilder) -> None:
+            try:
+                send = self._prepare(builder)
+                barrier.wait()
+                started = time.perf_counter()
+                response = send()
+                results[index] = ConcurrentResult(
+                    response,
+                    started - release_time,
+                    time.perf_counter() - started,
+                )
+            except threading.BrokenBarrierError:
+                pass
+            except Exception as e:
+                errors.append(e)
+                barrier.abort()
+            finally:
+                builder.close()
+
+        threads = [
+            threading.Thread(target=worker, args=(index, builder), daemon=True)
+            for index, builder in enumerate(builders)
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            # Requests are prepared once every thread reached the barrier
+            barrier.wait()
+        except threading.BrokenBarrierError:
+            pass
+        for thread in threads:
+            thread.join()
+        if errors:
+            raise errors[0]
+        missing = results.count(None)
+        if missing:
+            raise TimeoutError(
+                f"{missing} of {len(results)} requests weren't sent: the threads "
+                f"weren't all ready to send them within {self.timeout} seconds"
+            )
+        return cast(List[ConcurrentResult], results)
+
+    def _prepare(self, builder: EnvironBuilder) -> Any:
+        """Return a function sending the request of ``builder``, with as
+        much as possible of the work done ahead."""
+        if self.live_server is None:
+            client = self.app.test_client()
+            environ = builder.get_environ()
+            return lambda: client.open(environ)
+
+        method, path, body, headers = _http_request(builder)
+        conn = http.client.HTTPConnection(
+            self.live_server.host, self.live_server.port, timeout=self.timeout
+        )
+        conn.connect()
+
+        def send() -> Any:
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                data = response.read()
+            finally:
+                conn.close()
+            return self.app.response_class(
+                data, status=response.status, headers=response.getheaders()
+            )
+
+        return send
+
+
+def _http_request(builder: EnvironBuilder) -> Tuple[str, str, bytes, Dict[str, str]]:
+    """Return the method, path, body and headers of the request of
+    ``builder``, to send it over HTTP."""
+    environ = builder.get_environ()
+    body = environ["wsgi.input"].read()
+    headers = dict(builder.headers)
+    if environ.get("CONTENT_TYPE"):
+        headers["Content-Type"] = environ["CONTENT_TYPE"]
+    if body:
+        headers["Content-Length"] = str(len(body))
+    path = environ["PATH_INFO"]
+    if environ.get("QUERY_STRING"):
+        path += "?" + environ["QUERY_STRING"]
+    return builder.method, path, body, headers
+
+
+def _make_builder(app: Any, request: Any) -> EnvironBuilder:
+    if isinstance(request, str):
+        return EnvironBuilder(app, request)
+    if isinstance(request, dict):
+        return EnvironBuilder(app, **request)
+    args, kwargs = request
+    return EnvironBuilder(app, *args, **kwargs)
@@ -1,33 +1,129 @@
 #!/usr/bin/env python
+import hashlib
+import os
+import pathlib
 import socket
+import weakref
 from typing import Any
 from typing import cast
+from typing import Dict
 from typing import Generator
+from typing import List
+from typing import Tuple
+from typing import TYPE_CHECKING
 
 import pytest
-from flask import Flask as _FlaskApp
-from flask.config import Config as _FlaskAppConfig
-from flask.testing import FlaskClient as _FlaskTestClient
 from pytest import Config as _PytestConfig
 from pytest import FixtureRequest as _PytestFixtureRequest
 
+from ._internal import _accept_matrix_options
+from ._internal import _adaptive_wait
+from ._internal import _allocation_tracker_key
+from ._internal import _compiled_templates_key
+from ._internal import _DEFAULT_MIMETYPES
 from ._internal import _determine_scope
+from ._internal import _live_servers_key
 from ._internal import _make_accept_header
+from ._internal import _profile_dir_key
+from ._internal import _replay_cache_key
 from ._internal import _rewrite_server_name
-from .live_server import LiveServer
+from ._internal import _SHARED_DIR_KEY
+from ._internal import _STARTUP_CACHE_KEY
+from ._internal import _startup_history_key
+from ._internal import _virtual_clock_key
+from ._internal import _virtual_clock_used_key
+from .pytest_compat import getfixturevalue
+
+# Flask, werkzeug and the live server machinery are only imported when a
+# fixture needs them, so that the plugin doesn't slow down the startup of
+# pytest in environments which don't test Flask applications.
+if TYPE_CHECKING:  # pragma: no cover
+    from flask import Flask as _FlaskApp
+    from flask.config import Config as _FlaskAppConfig
+    from flask.testing import FlaskClient as _FlaskTestClient
+
+    from .allocations import AllocationTracker
+    from .benchmark import FlaskBenchmark
+    from .clock import VirtualClock
+    from .concurrency import ConcurrentClient
+    from .live_server import LiveServer
+    from .load import LiveLoad
+    from .negotiation import AcceptMatrix
+    from .shared import SharedDatasets
+    from .streaming import StreamingClient
+
+
+def __getattr__(name: str) -> Any:
+    # ``LiveServer`` used to be importable from this module
+    if name == "LiveServer":
+        from .live_server import LiveServer
+
+        return LiveServer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 @pytest.fixture
-def client(app: _FlaskApp) -> Generator[_FlaskTestClient, Any, Any]:
+def client(
+    request: _PytestFixtureRequest, app: "_FlaskApp"
+) -> Generator["_FlaskTestClient", Any, Any]:
     """A Flask test client. An instance of :class:`flask.testing.TestClient`
     by default.
+
+    Responses are replayed for tests marked with ``pytest.mark.replay`` when
+    ``--flask-replay`` is enabled, the views it requests are recorded
+    when ``--flask-changed`` is enabled, and the memory allocated by requests
+    is traced with ``--flask-allocations`` or the ``flask_allocations``
+    fixture.
     """
+    selector = request.config.pluginmanager.get_plugin("flask_changed")
+    if selector is not None:
+        from flask import request_started
+
+        def observe(sender: "_FlaskApp", **extra: Any) -> None:
+            from flask import request as flask_request
+
+            selector.observe(request.node.nodeid, sender, flask_request.endpoint)
+
+        selector.track(request.node.nodeid)
+        request_started.connect(observe, app)
+        request.addfinalizer(lambda: request_started.disconnect(observe, app))
+
     with app.test_client() as client:
+        marker = request.node.get_closest_marker("replay")
+        mode = request.config.getvalue("flask_replay")
+        if marker is not None and mode != "off":
+            from .replay import ReplayClient
+            from .replay import ResponseCache
+
+            cache = request.config.stash.get(_replay_cache_key, None)
+            if cache is None:
+                cache = ResponseCache(getattr(request.config, "cache", None))
+                request.config.stash[_replay_cache_key] = cache
+            ReplayClient(client, cache, mode, *marker.args, **marker.kwargs)
+
+        tracker = None
+        trace_all = request.config.getvalue("flask_allocations")
+        if trace_all or "flask_allocations" in request.fixturenames:
+            from .allocations import AllocationTracker
+
+            tracker = AllocationTracker(client)
+            request.node.stash[_allocation_tracker_key] = tracker
         yield client
 
+        if tracker is not None and trace_all:
+            totals: Dict[Any, List[int]] = {}
+            for record in tracker.records:
+                total = totals.setdefault(record.endpoint, [0, 0, 0])
+                total[0] += 1
+                total[1] = max(total[1], record.peak)
+                total[2] = max(total[2], record.net)
+            request.node.user_properties.append(
+                ("flask_allocations", [[key, *total] for key, total in totals.items()])
+            )
+
 
 @pytest.fixture
-def client_class(request: _PytestFixtureRequest, client: _FlaskTestClient) -> None:
+def client_class(request: _PytestFixtureRequest, client: "_FlaskTestClient") -> None:
     """Uses to set a ``client`` class attribute to current Flask test client::
 
     @pytest.mark.usefixtures('client_class')
@@ -47,8 +143,8 @@ def client_class(request: _PytestFixtureRequest, client: _FlaskTestClient) -> No
 
 @pytest.fixture(scope=_determine_scope)
 def live_server(
-    request: _PytestFixtureRequest, app: _FlaskApp, pytestconfig: _PytestConfig
-) -> Generator[LiveServer, Any, Any]:  # pragma: no cover
+    request: _PytestFixtureRequest, app: "_FlaskApp", pytestconfig: _PytestConfig
+) -> Generator["LiveServer", Any, Any]:  # pragma: no cover
     """Run application in a separate process.
 
     When the ``live_server`` fixture is applied, the ``url_for`` function
@@ -62,10 +158,88 @@ def live_server(
             assert res.code == 200
 
     """
+    server, original_server_name = _make_live_server(request, app)
+    if request.config.getvalue("start_live_server"):
+        server.start()
+
+    request.addfinalizer(server.stop)
+
+    yield server
+
+    if original_server_name is not None:
+        app.config["SERVER_NAME"] = original_server_name
+
+
+@pytest.fixture(scope=_determine_scope)
+def live_servers(
+    request: _PytestFixtureRequest, apps: Dict[str, "_FlaskApp"]
+) -> Generator[Dict[str, "LiveServer"], Any, Any]:  # pragma: no cover
+    """Run several applications, provided by the ``apps`` fixture as a
+    dictionary, each in a separate process. Servers are started and stopped
+    concurrently::
+
+        @pytest.fixture(scope='session')
+        def apps():
+            return {'users': create_users_app(), 'orders': create_orders_app()}
+
+        def test_services(live_servers):
+            res = urlopen(live_servers['orders'].url('/orders'))
+            assert res.code == 200
+
+    """
+    from .live_server import start_live_servers
+    from .live_server import stop_live_servers
+
+    servers = {}
+    original_server_names = {}
+    for offset, (name, app) in enumerate(apps.items()):
+        servers[name], original_server_names[name] = _make_live_server(
+            request, app, offset
+        )
+
+    request.addfinalizer(lambda: stop_live_servers(list(servers.values())))
+    if request.config.getvalue("start_live_server"):
+        start_live_servers(list(servers.values()))
+
+    yield servers
+
+    for name, app in apps.items():
+        if original_server_names[name] is not None:
+            app.config["SERVER_NAME"] = original_server_names[name]
+
+
+def _make_live_server(
+    request: _PytestFixtureRequest, app: "_FlaskApp", offset: int = 0
+) -> Tuple["LiveServer", str]:
+    """Create a live server for ``app`` from the command line options and
+    return it with the original ``SERVER_NAME`` of the application.
+
+    :param offset: Added to ``--live-server-port``, if set, to give each
+                   application of ``live_servers`` a distinct port.
+    """
+    from .live_server import LiveServer
+
+    from .live_server import _pid_exists
+    from .live_server import read_reuse_file
+
+    config = request.config
+
+    reuse_file = None
+    workerinput = getattr(config, "workerinput", {})
+    if config.getvalue("live_server_reuse") or _SHARED_DIR_KEY in workerinput:
+        reuse_file = _live_server_reuse_file(config, app, offset)
+
     # Set or get a port
     port = app.config.get("LIVESERVER_PORT", None)
     if not port:
-        port = pytestconfig.getvalue("live_server_port")
+        port = config.getvalue("live_server_port")
+        if port:
+            port += offset
+    if not port and reuse_file is not None:
+        # Keep the port of the server left running by a previous session
+        state = read_reuse_file(reuse_file)
+        if state is not None and _pid_exists(state["pid"]):
+            port = state["port"]
 
     if port == 0:
         # Bind to an open port
@@ -74,35 +248,277 @@ def live_server(
         port = s.getsockname()[1]
         s.close()
 
-    host = cast(str, pytestconfig.getvalue("live_server_host"))
+    host = cast(str, config.getvalue("live_server_host"))
 
     # Explicitly set application ``SERVER_NAME`` for test suite
     original_server_name = app.config["SERVER_NAME"] or "localhost.localdomain"
     final_server_name = _rewrite_server_name(original_server_name, str(port))
     app.config["SERVER_NAME"] = final_server_name
 
-    wait = cast(int, request.config.getvalue("live_server_wait"))
-    clean_stop = cast(bool, request.config.getvalue("live_server_clean_stop"))
+    wait = cast(float, config.getvalue("live_server_wait"))
+    backend = cast(str, config.getvalue("live_server_backend"))
+    if config.getvalue("live_server_adaptive_wait") and getattr(config, "cache", None):
+        history = config.cache.get(_STARTUP_CACHE_KEY, {})
+        wait = _adaptive_wait(history.get(_startup_history_key(app, backend), []), wait)
+    clean_stop = cast(bool, config.getvalue("live_server_clean_stop"))
+    access_log = cast(str, config.getvalue("live_server_access_log"))
+    profile_dir = config.stash.get(_profile_dir_key, None)
+
+    health_url = app.config.get(
+        "LIVESERVER_HEALTH_URL", config.getvalue("live_server_health_url")
+    )
+    warmup = app.config.get(
+        "LIVESERVER_WARMUP", config.getvalue("live_server_warmup") or ()
+    )
+
+    # Live server processes inherit the compiled templates
+    if config.getvalue("flask_template_cache"):
+        _compile_app_templates(config, app)
+
+    # The virtual clock slows down time functions in the server process, so
+    # it is only installed when a test may use it
+    clock = None
+    if config.stash.get(_virtual_clock_used_key, True):
+        clock = _virtual_clock(config)
+
+    server = LiveServer(
+        app,
+        host,
+        port,
+        wait,
+        clean_stop,
+        access_log,
+        profile_dir,
+        backend,
+        health_url,
+        warmup,
+        reuse_file,
+        clock,
+    )
+    server.scope = request.scope
+    config.stash.setdefault(_live_servers_key, []).append(server)
+    return server, original_server_name
+
+
+def _compile_app_templates(config: _PytestConfig, app: "_FlaskApp") -> None:
+    """Compile the templates of ``app`` with ``--flask-template-cache``,
+    once per Jinja environment."""
+    from .templates import compile_templates
+
+    compiled = config.stash.setdefault(_compiled_templates_key, weakref.WeakSet())
+    if app.jinja_env in compiled:
+        return
+    cache_dir = config.cache.mkdir("pytest_flask") / "templates"
+    compile_templates(app, str(cache_dir))
+    compiled.add(app.jinja_env)
+
+
+def _virtual_clock(config: _PytestConfig) -> "VirtualClock":
+    """Return the virtual clock shared by the live servers of the session."""
+    from .clock import VirtualClock
+
+    clock = config.stash.get(_virtual_clock_key, None)
+    if clock is None:
+        clock = config.stash[_virtual_clock_key] = VirtualClock()
+    return clock
+
+
+def _live_server_reuse_file(
+    config: _PytestConfig, app: "_FlaskApp", offset: int
+) -> str:
+    """Return the path of the file recording the live server of ``app`` left
+    running by previous sessions with ``--live-server-reuse``, or shared by
+    the pytest-xdist workers with ``--live-server-shared``."""
+    shared_dir = getattr(config, "workerinput", {}).get(_SHARED_DIR_KEY)
+    option = "--live-server-shared" if shared_dir else "--live-server-reuse"
+    if not hasattr(os, "fork"):
+        raise pytest.UsageError(f"{option} needs os.fork().")
+    if shared_dir is None and getattr(config, "cache", None) is None:
+        raise pytest.UsageError(f"{option} needs the cacheprovider plugin.")
+    if (
+        config.getvalue("live_server_access_log") == "capture"
+        or config.getvalue("live_server_profile") is not None
+    ):
+        raise pytest.UsageError(
+            f"{option} can't be combined with "
+            "--live-server-access-log=capture or --live-server-profile."
+        )
+    key = hashlib.sha256(f"{app.import_name}:{offset}".encode()).hexdigest()
+    if shared_dir is not None:
+        directory = pathlib.Path(shared_dir)
+    else:
+        directory = config.cache.mkdir("pytest_flask")
+    return str(directory / f"live_server-{key[:16]}.json")
 
-    server = LiveServer(app, host, port, wait, clean_stop)
-    if request.config.getvalue("start_live_server"):
-        server.start()
 
-    request.addfinalizer(server.stop)
+@pytest.fixture
+def streaming_client(
+    client: "_FlaskTestClient",
+) -> Generator["StreamingClient", Any, Any]:
+    """A client streaming request bodies from files or iterables and spooling
+    response bodies to temporary files::
 
-    yield server
+    def test_upload(streaming_client, tmp_path):
+        res = streaming_client.post('/upload', body=tmp_path / 'big.bin')
+        assert res == 200
+        assert res.body.mmap()[:4] == b'%PDF'
 
-    if original_server_name is not None:
-        app.config["SERVER_NAME"] = original_server_name
+    """
+    from .streaming import StreamingClient
+
+    streaming_client = StreamingClient(client)
+    yield streaming_client
+    streaming_client.close()
+
+
+@pytest.fixture
+def concurrent_client(
+    request: _PytestFixtureRequest, app: "_FlaskApp"
+) -> "ConcurrentClient":
+    """Send requests from several threads released at the same time, to the
+    live server if the test uses it, or else to the application in process::
+
+    def test_double_submit(concurrent_client):
+        results = concurrent_client.run(8, '/orders', method='POST')
+        assert sorted(r.response.status_code for r in results) == [201] + [409] * 7
+
+    """
+    from .concurrency import ConcurrentClient
+
+    live_server = None
+    if "live_server" in request.fixturenames:
+        live_server = getfixturevalue(request, "live_server")
+    return ConcurrentClient(app, live_server)
+
+
+@pytest.fixture
+def virtual_clock(
+    request: _PytestFixtureRequest, monkeypatch: pytest.MonkeyPatch
+) -> Generator["VirtualClock", Any, Any]:
+    """A clock moved forward instantly, shared by the test and the live
+    servers it uses::
+
+    def test_rate_limit(live_server, virtual_clock):
+        assert urlopen(live_server.url('/api')).status == 200
+        with pytest.raises(HTTPError, match='429'):
+            urlopen(live_server.url('/api'))
+        virtual_clock.advance(60)
+        assert urlopen(live_server.url('/api')).status == 200
+
+    """
+    servers = []
+    if "live_server" in request.fixturenames:
+        servers.append(getfixturevalue(request, "live_server"))
+    if "live_servers" in request.fixturenames:
+        servers.extend(getfixturevalue(request, "live_servers").values())
+    for server in servers:
+        if server.reuse_file is not None:
+            pytest.fail(
+                "virtual_clock can't be used with a live server shared by "
+                "--live-server-reuse or --live-server-shared."
+            )
+
+    clock = _virtual_clock(request.config)
+    clock.install(monkeypatch)
+    clock.enable()
+    yield clock
+    clock.disable()
+
+
+@pytest.fixture(scope="session")
+def shared_datasets() -> Generator["SharedDatasets", Any, Any]:
+    """Datasets shared read-only between the test process and the live
+    server, without copying them. Request it from the ``app`` fixture::
+
+    @pytest.fixture(scope='session')
+    def app(shared_datasets):
+        geo = shared_datasets.add_file('geo', 'data/geo.bin')
+        return create_app(geo=geo.buffer)
+
+    """
+    from .shared import SharedDatasets
+
+    datasets = SharedDatasets()
+    yield datasets
+    datasets.close()
+
+
+@pytest.fixture
+def flask_allocations(
+    request: _PytestFixtureRequest, client: "_FlaskTestClient"
+) -> "AllocationTracker":
+    """Trace the memory allocated by the requests of the ``client`` fixture,
+    to assert upper bounds::
+
+    def test_export(client, flask_allocations):
+        client.get('/export')
+        flask_allocations.assert_max(peak=2 * 1024 * 1024, net=64 * 1024)
+
+    """
+    return request.node.stash[_allocation_tracker_key]
+
+
+@pytest.fixture
+def flask_benchmark(
+    request: _PytestFixtureRequest, client: "_FlaskTestClient"
+) -> Generator["FlaskBenchmark", Any, Any]:
+    """Time a request to the application, through the test client, or to the
+    live server if the test uses it, and compare the result with the saved
+    baseline::
+
+    def test_index_speed(flask_benchmark):
+        assert flask_benchmark('/') == 200
+
+    The ``flask_benchmark`` marker sets the parameters of
+    :class:`~pytest_flask.benchmark.FlaskBenchmark`.
+    """
+    from .benchmark import BenchmarkStore
+    from .benchmark import FlaskBenchmark
+
+    config = request.config
+    live_server = None
+    if "live_server" in request.fixturenames:
+        live_server = getfixturevalue(request, "live_server")
+    store = BenchmarkStore(
+        getattr(config, "cache", None), config.getvalue("flask_benchmark_save")
+    )
+    options = {"tolerance": config.getvalue("flask_benchmark_tolerance")}
+    marker = request.node.get_closest_marker("flask_benchmark")
+    if marker is not None:
+        options.update(marker.kwargs)
+
+    benchmark = FlaskBenchmark(
+        client, store, request.node.nodeid, live_server, **options
+    )
+    yield benchmark
+    if benchmark.results:
+        request.node.user_properties.append(
+            ("flask_benchmark", [result.as_dict() for result in benchmark.results])
+        )
+
+
+@pytest.fixture
+def live_load(live_server: "LiveServer") -> "LiveLoad":
+    """Generate concurrent HTTP load against the live server::
+
+    def test_index_under_load(live_load):
+        report = live_load.run('/', concurrency=8, duration=2)
+        assert report.error_rate == 0
+        assert report.percentile(95) < 0.1
+
+    """
+    from .load import LiveLoad
+
+    return LiveLoad(live_server)
 
 
 @pytest.fixture
-def config(app: _FlaskApp) -> _FlaskAppConfig:
+def config(app: "_FlaskApp") -> "_FlaskAppConfig":
     """An application config."""
     return app.config
 
 
-@pytest.fixture(params=["application/json", "text/html"])
+@pytest.fixture(params=_DEFAULT_MIMETYPES)
 def mimetype(request) -> str:
     return request.param
 
@@ -125,3 +541,23 @@ def accept_jsonp():
 @pytest.fixture(params=["*", "*/*"])
 def accept_any(request):
     return _make_accept_header(request.param)
+
+
+@pytest.fixture
+def accept_matrix(request: _PytestFixtureRequest) -> "AcceptMatrix":
+    """A content negotiation matrix built from the ``accept_matrix`` marker
+    to run a view across every header set in a single test::
+
+        @pytest.mark.accept_matrix(
+            mimetypes=['application/json', 'text/html'],
+            charsets=['utf-8', 'latin-1'],
+        )
+        def test_negotiation(client, accept_matrix):
+            for headers, res in accept_matrix.run(client, '/ping'):
+                assert res.status_code == 200
+
+    """
+    from .negotiation import AcceptMatrix
+
+    marker = request.node.get_closest_marker("accept_matrix")
+    return AcceptMatrix(*_accept_matrix_options(marker))
@@ -1,17 +1,54 @@
+import cProfile
+import glob
+import hashlib
+import http.client
+import importlib
+import inspect
+import json
 import logging
 import multiprocessing
 import os
 import platform
+import pstats
+import queue
+import random
+import selectors
 import signal
 import socket
+import stat
+import sys
+import tempfile
+import threading
 import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
 from multiprocessing import Process
+from multiprocessing.connection import Connection
 from typing import Any
+from typing import Callable
 from typing import cast
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+from typing import NoReturn
 from typing import Protocol
+from typing import Sequence
+from typing import Tuple
 from typing import Union
 
 import pytest
+from werkzeug.exceptions import HTTPException
+from werkzeug.exceptions import InternalServerError
+from werkzeug.serving import BaseWSGIServer
+from werkzeug.serving import WSGIRequestHandler
+from werkzeug.wsgi import ClosingIterator
+from werkzeug.wsgi import LimitedStream
+
+from ._internal import _rewrite_server_name
+from .clock import VirtualClock
+from .replay import config_fingerprint
+from .resources import ResourceUsage
+from .resources import sample_process
 
 
 class _SupportsFlaskAppRun(Protocol):
@@ -25,11 +62,518 @@ class _SupportsFlaskAppRun(Protocol):
     ) -> None: ...
 
 
+#: First and largest delays (in seconds) between readiness probes.
+_READY_BACKOFF_BASE = 0.005
+_READY_BACKOFF_MAX = 0.5
+
+#: Seconds after which a reusable live server which wasn't used stops.
+_REUSE_IDLE_TIMEOUT = 3600
+
 # force 'fork' on macOS
 if platform.system() == "Darwin":
     multiprocessing = multiprocessing.get_context("fork")  # type: ignore[assignment]
 
 
+class AccessRecord(NamedTuple):
+    """A request served by the live server."""
+
+    method: str
+    path: str
+    status: int
+    duration: float
+
+
+class _QuietRequestHandler(WSGIRequestHandler):
+    """Request handler which doesn't write the access log to stderr."""
+
+    def log_request(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+
+class _AccessLogShipper:
+    """Collects access records in the live server process and sends them to
+    the test process when it asks for a flush.
+
+    Records are only sent by the thread answering flushes, while the test
+    process is reading the pipe, so request threads never block on a full
+    pipe.
+    """
+
+    def __init__(self, conn: Connection):
+        self.conn = conn
+        self._pending: List[AccessRecord] = []
+        self._in_flight = 0
+        self._idle = threading.Condition()
+
+    def begin(self) -> None:
+        with self._idle:
+            self._in_flight += 1
+
+    def add(self, record: AccessRecord) -> None:
+        with self._idle:
+            self._in_flight -= 1
+            self._pending.append(record)
+            self._idle.notify_all()
+
+    def run(self) -> None:
+        try:
+            while True:
+                self.conn.recv()
+                with self._idle:
+                    # The client may read a response before the server is
+                    # done with it, wait for requests still in flight.
+                    self._idle.wait_for(lambda: not self._in_flight, timeout=1)
+                    records, self._pending = self._pending, []
+                self.conn.send(("flush", records))
+        except (EOFError, OSError):
+            pass
+
+
+class _AccessLogMiddleware:
+    """WSGI middleware which records an :class:`AccessRecord` for each
+    request once its response has been sent."""
+
+    def __init__(self, wsgi_app: Any, shipper: _AccessLogShipper):
+        self.wsgi_app = wsgi_app
+        self.shipper = shipper
+
+    def __call__(self, environ, start_response):
+        start_time = time.perf_counter()
+        status = []
+
+        def _start_response(status_line, headers, exc_info=None):
+            status.append(int(status_line.split(" ", 1)[0]))
+            return start_response(status_line, headers, exc_info)
+
+        def record():
+            self.shipper.add(
+                AccessRecord(
+                    environ["REQUEST_METHOD"],
+                    environ.get("PATH_INFO", ""),
+                    status[0] if status else 500,
+                    time.perf_counter() - start_time,
+                )
+            )
+
+        self.shipper.begin()
+        try:
+            app_iter = self.wsgi_app(environ, _start_response)
+        except BaseException:
+            record()
+            raise
+        return ClosingIterator(app_iter, record)
+
+
+class _ProfilerMiddleware:
+    """WSGI middleware which profiles each request with :mod:`cProfile` and
+    aggregates the results per endpoint."""
+
+    def __init__(self, wsgi_app: Any, url_map: Any):
+        self.wsgi_app = wsgi_app
+        self.url_map = url_map
+        self.stats: Dict[str, pstats.Stats] = {}
+        self._lock = threading.Lock()
+
+    def _endpoint(self, environ) -> str:
+        try:
+            endpoint, _ = self.url_map.bind_to_environ(environ).match()
+        except HTTPException:
+            return "_unmatched"
+        return str(endpoint)
+
+    def __call__(self, environ, start_response):
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Only a single profiler may be active at a time on Python 3.12+,
+            # concurrent requests are served without being profiled.
+            return self.wsgi_app(environ, start_response)
+        try:
+            return self.wsgi_app(environ, start_response)
+        finally:
+            profiler.disable()
+            self._add(self._endpoint(environ), profiler)
+
+    def _add(self, endpoint: str, profiler: cProfile.Profile) -> None:
+        with self._lock:
+            if endpoint in self.stats:
+                self.stats[endpoint].add(profiler)
+            else:
+                self.stats[endpoint] = pstats.Stats(profiler)
+
+    def dump(self, directory: str) -> None:
+        """Write one pstats file per endpoint to a new subdirectory of
+        ``directory``, to be merged with those of the other live servers by
+        :func:`merge_profiles`."""
+        directory = tempfile.mkdtemp(dir=directory)
+        with self._lock:
+            for endpoint, stats in self.stats.items():
+                stats.dump_stats(os.path.join(directory, endpoint + ".prof"))
+
+
+def merge_profiles(source: str, directory: str) -> None:
+    """Merge the pstats files written by the live servers of the session in
+    the subdirectories of ``source`` into one file per endpoint in
+    ``directory``."""
+    merged: Dict[str, pstats.Stats] = {}
+    for path in sorted(glob.glob(os.path.join(source, "*", "*.prof"))):
+        name = os.path.basename(path)
+        if name in merged:
+            merged[name].add(path)
+        else:
+            merged[name] = pstats.Stats(path)
+    if merged:
+        os.makedirs(directory, exist_ok=True)
+    for name, stats in merged.items():
+        stats.dump_stats(os.path.join(directory, name))
+
+
+class _KeepAliveRequestHandler(WSGIRequestHandler):
+    """Request handler which keeps HTTP/1.1 connections alive and so
+    supports pipelined requests, unlike werkzeug's handler which closes every
+    connection after the response and waits for leftover request data."""
+
+    protocol_version = "HTTP/1.1"
+
+    def run_wsgi(self) -> None:
+        environ = self.make_environ()
+        if environ.get("wsgi.input_terminated"):
+            # Chunked request body, don't try to find where it ends
+            self.close_connection = True
+            body = None
+        else:
+            content_length = int(environ.get("CONTENT_LENGTH") or 0)
+            body = LimitedStream(self.rfile, content_length)  # type: ignore[arg-type]
+            environ["wsgi.input"] = body
+
+        response: List[Any] = []
+        headers_sent = False
+        chunked = False
+
+        def write(data: bytes) -> None:
+            nonlocal headers_sent, chunked
+            if not headers_sent:
+                headers_sent = True
+                status, headers = response
+                code_str, _, msg = status.partition(" ")
+                code = int(code_str)
+                self.send_response(code, msg)
+                header_keys = set()
+                for key, value in headers:
+                    self.send_header(key, value)
+                    header_keys.add(key.lower())
+                if not (
+                    "content-length" in header_keys
+                    or environ["REQUEST_METHOD"] == "HEAD"
+                    or 100 <= code < 200
+                    or code in (204, 304)
+                ):
+                    if self.request_version == "HTTP/1.1":
+                        chunked = True
+                        self.send_header("Transfer-Encoding", "chunked")
+                    else:
+                        # HTTP/1.0 clients don't know chunked encoding, the
+                        # end of the body is told by closing the connection
+                        self.close_connection = True
+                if self.close_connection:
+                    self.send_header("Connection", "close")
+                self.end_headers()
+            if data and chunked:
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            elif data:
+                self.wfile.write(data)
+
+        def start_response(status, headers, exc_info=None):
+            if exc_info:
+                try:
+                    if headers_sent:
+                        raise exc_info[1].with_traceback(exc_info[2])
+                finally:
+                    exc_info = None
+            response[:] = [status, headers]
+            return write
+
+        def execute(app: Any) -> None:
+            app_iter = app(environ, start_response)
+            try:
+                for data in app_iter:
+                    write(data)
+                if not headers_sent:
+                    write(b"")
+                if chunked:
+                    self.wfile.write(b"0\r\n\r\n")
+            finally:
+                if hasattr(app_iter, "close"):
+                    app_iter.close()
+
+        try:
+            execute(self.server.app)
+        except (ConnectionError, socket.timeout):
+            self.close_connection = True
+            return
+        except Exception:
+            self.close_connection = True
+            self.log_error("Error on request:\n%s", traceback.format_exc())
+            if headers_sent:
+                return
+            execute(InternalServerError())
+
+        if body is not None and not self.close_connection:
+            # Skip the request body the application didn't read
+            body.exhaust()
+
+    def handle(self) -> None:
+        #: Whether the connection was left open waiting for another request.
+        self.idle = False
+        super().handle()
+
+    def handle_one_request(self) -> None:
+        super().handle_one_request()
+        if not self.close_connection and not self._request_pending():
+            # Give the thread back, the server watches the connection until
+            # the next request arrives
+            self.idle = True
+            self.close_connection = True
+
+    def _request_pending(self) -> bool:
+        # Pipelined requests may already be buffered in ``rfile``, peeking
+        # without blocking returns them or what the socket has to read
+        timeout = self.connection.gettimeout()
+        self.connection.setblocking(False)
+        try:
+            return bool(self.rfile.peek(1))  # type: ignore[attr-defined]
+        finally:
+            self.connection.settimeout(timeout)
+
+
+class _QuietKeepAliveRequestHandler(_KeepAliveRequestHandler):
+    def log_request(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+
+class _ThreadPoolWSGIServer(BaseWSGIServer):
+    """WSGI server which handles requests with a fixed pool of threads
+    instead of starting a thread per connection. Connections are kept alive
+    until they are idle for ``keep_alive_timeout`` seconds.
+
+    Idle connections don't hold a thread: they are watched with a selector
+    and only handed to the pool when a request arrives, so that any number
+    of kept alive connections can wait while ``threads`` requests are
+    handled at once.
+    """
+
+    multithread = True
+
+    def __init__(
+        self,
+        *args: Any,
+        threads: int = 32,
+        keep_alive_timeout: float = 5,
+        **kwargs: Any,
+    ):
+        super().__init__(*args, **kwargs)
+        self.keep_alive_timeout = keep_alive_timeout
+        self._requests: "queue.Queue[Any]" = queue.Queue()
+        self._idle = selectors.DefaultSelector()
+        self._idle_lock = threading.Lock()
+        # Wakes up the selector when a connection is added to it
+        self._wakeup, self._wakeup_signal = socket.socketpair()
+        self._wakeup.setblocking(False)
+        self._idle.register(self._wakeup, selectors.EVENT_READ)
+        # Daemon threads, so that connections kept alive don't delay the exit
+        threading.Thread(target=self._watch_idle, daemon=True).start()
+        for _ in range(threads):
+            threading.Thread(target=self._process_requests, daemon=True).start()
+
+    def process_request(self, request, client_address):
+        request.settimeout(self.keep_alive_timeout)
+        # Headers and body are written separately, don't let Nagle's
+        # algorithm delay the body on kept alive connections.
+        request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._park(request, client_address)
+
+    def _park(self, request, client_address):
+        with self._idle_lock:
+            self._idle.register(
+                request, selectors.EVENT_READ, (client_address, time.monotonic())
+            )
+        self._wakeup_signal.send(b"\0")
+
+    def _watch_idle(self):
+        while True:
+            events = self._idle.select(timeout=min(self.keep_alive_timeout, 1))
+            now = time.monotonic()
+            with self._idle_lock:
+                for key, _ in events:
+                    if key.fileobj is self._wakeup:
+                        try:
+                            while self._wakeup.recv(4096):
+                                pass
+                        except BlockingIOError:
+                            pass
+                        continue
+                    self._idle.unregister(key.fileobj)
+                    self._requests.put((key.fileobj, key.data[0]))
+                expired = [
+                    key
+                    for key in self._idle.get_map().values()
+                    if key.data and now - key.data[1] > self.keep_alive_timeout
+                ]
+                for key in expired:
+                    self._idle.unregister(key.fileobj)
+            for key in expired:
+                self.shutdown_request(key.fileobj)
+
+    def _process_requests(self):
+        while True:
+            request, client_address = self._requests.get()
+            idle = False
+            try:
+                handler = self.RequestHandlerClass(request, client_address, self)
+                idle = getattr(handler, "idle", False)
+            except Exception:
+                self.handle_error(request, client_address)
+            if idle:
+                self._park(request, client_address)
+            else:
+                self.shutdown_request(request)
+
+
+def _run_dev_server(
+    app: _SupportsFlaskAppRun, host: str, port: int, quiet: bool = False
+) -> None:
+    options: Dict[str, Any] = {"request_handler": _QuietRequestHandler} if quiet else {}
+    app.run(host=host, port=port, use_reloader=False, threaded=True, **options)
+
+
+def _run_threadpool_server(app: Any, host: str, port: int, quiet: bool = False):
+    handler = _QuietKeepAliveRequestHandler if quiet else _KeepAliveRequestHandler
+    _ThreadPoolWSGIServer(host, port, app, handler=handler).serve_forever()
+
+
+#: Live server backends, see :func:`_resolve_backend`.
+SERVER_BACKENDS: Dict[str, Callable[..., None]] = {
+    "dev": _run_dev_server,
+    "threadpool": _run_threadpool_server,
+}
+
+
+def _resolve_backend(backend: str) -> Callable[..., None]:
+    """Return the function serving an application for ``backend``, either
+    the name of a builtin backend or a ``module:function`` import path.
+
+    The function is called in the live server process with the application,
+    the host, the port and a ``quiet`` keyword argument telling whether
+    request logging should be disabled, and serves the application until
+    interrupted.
+    """
+    if backend in SERVER_BACKENDS:
+        return SERVER_BACKENDS[backend]
+    module_name, sep, name = backend.partition(":")
+    if not sep:
+        raise ValueError(
+            "unknown live server backend {!r}, expected one of {} or "
+            "'module:function'".format(backend, ", ".join(SERVER_BACKENDS))
+        )
+    return getattr(importlib.import_module(module_name), name)
+
+
+def _raise_keyboard_interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+def _serve_app(
+    app: _SupportsFlaskAppRun,
+    host: str,
+    port: int,
+    access_log: str,
+    conn: Union[Connection, None],
+    profile_dir: Union[str, None],
+    serve: Callable[..., None],
+    clock: Union[VirtualClock, None] = None,
+) -> None:
+    """Serve ``app`` in the live server process."""
+    if clock is not None:
+        clock.install()
+    profiler = None
+    if profile_dir is not None:
+        profiler = _ProfilerMiddleware(
+            app.wsgi_app, app.url_map  # type: ignore[attr-defined]
+        )
+        app.wsgi_app = profiler  # type: ignore[attr-defined]
+        # Unwind the server on ``terminate()`` too, to write the stats
+        signal.signal(signal.SIGTERM, _raise_keyboard_interrupt)
+    if conn is not None:
+        shipper = _AccessLogShipper(conn)
+        threading.Thread(target=shipper.run, daemon=True).start()
+        app.wsgi_app = _AccessLogMiddleware(  # type: ignore[attr-defined]
+            app.wsgi_app, shipper  # type: ignore[attr-defined]
+        )
+    try:
+        serve(app, host, port, quiet=access_log != "stderr")
+    finally:
+        if profiler is not None:
+            profiler.dump(profile_dir)  # type: ignore[arg-type]
+
+
+def read_reuse_file(path: str) -> Union[Dict[str, Any], None]:
+    """Read the ``host``, ``port``, ``pid`` and ``fingerprint`` of the live
+    server left running by a previous run from ``path``, if any."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_reuse_file(path: str, state: Dict[str, Any]) -> None:
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+
+def _pid_exists(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _close_inherited_pipes() -> None:  # pragma: no cover
+    """Close the pipes inherited by a detached server, e.g. to pytest-xdist
+    or to the process reading the output of pytest, which would otherwise
+    wait for the server to exit."""
+    try:
+        fds = [int(fd) for fd in os.listdir("/proc/self/fd")]
+    except OSError:
+        fds = list(range(3, 256))
+    for fd in fds:
+        if fd < 3:
+            continue
+        try:
+            if stat.S_ISFIFO(os.fstat(fd).st_mode):
+                os.close(fd)
+        except OSError:
+            pass
+
+
+def _watch_reuse_file(path: str, pid: int) -> None:  # pragma: no cover
+    while True:
+        time.sleep(1)
+        state = read_reuse_file(path)
+        try:
+            idle = time.time() - os.path.getmtime(path)
+        except OSError:
+            os._exit(0)
+        if state is None or state["pid"] != pid or idle > _REUSE_IDLE_TIMEOUT:
+            os._exit(0)
+
+
 class LiveServer:  # pragma: no cover
     """The helper class used to manage a live server. Handles creation and
     stopping application in a separate process.
@@ -39,6 +583,29 @@ class LiveServer:  # pragma: no cover
     :param port: The port to run application.
     :param wait: The timeout after which test case is aborted if
                  application is not started.
+    :param access_log: Where the access log goes: ``stderr`` (werkzeug
+                       default), ``capture`` to collect :class:`AccessRecord`
+                       in :attr:`access_log`, or ``off``.
+    :param profile_dir: The directory below which per-endpoint
+                        :mod:`cProfile` stats of the served requests are
+                        written when the server is stopped, see
+                        :func:`merge_profiles`. Profiling is disabled if
+                        ``None``.
+    :param backend: The server serving the application: ``dev`` (werkzeug
+                    development server), ``threadpool`` or a
+                    ``module:function`` import path.
+    :param health_url: The path requested to probe whether the application
+                       is ready, which must respond with a 2xx or 3xx status.
+                       The server is ready as soon as it accepts connections
+                       if ``None``.
+    :param warmup: Paths requested once the server is ready, before
+                   :meth:`start` returns.
+    :param clock: The virtual clock installed in the server process, unless
+                  it is reused by later sessions.
+    :param reuse_file: The file recording the server left running after the
+                       session to be reused by later sessions serving the
+                       same application. The server is stopped with the
+                       session if ``None``.
     """
 
     def __init__(
@@ -46,51 +613,327 @@ class LiveServer:  # pragma: no cover
         app: _SupportsFlaskAppRun,
         host: str,
         port: int,
-        wait: int,
+        wait: float,
         clean_stop: bool = False,
+        access_log: str = "stderr",
+        profile_dir: Union[str, None] = None,
+        backend: str = "dev",
+        health_url: Union[str, None] = None,
+        warmup: Sequence[str] = (),
+        reuse_file: Union[str, None] = None,
+        clock: Union[VirtualClock, None] = None,
     ):
         self.app = app
         self.port = port
         self.host = host
         self.wait = wait
         self.clean_stop = clean_stop
+        self.access_log_mode = access_log
+        self.profile_dir = profile_dir
+        self.backend = backend
+        self.health_url = health_url
+        self.warmup = list(warmup)
+        self.reuse_file = reuse_file
+        self.clock = clock
+        #: Whether the server left running by a previous session is used.
+        self.reused = False
+        self._detached_pid: Union[int, None] = None
+        self._serve = _resolve_backend(backend)
         self._process: Union[Process, None] = None
+        #: Resource usage of the server process once started and before stop.
+        self.start_usage: Union[ResourceUsage, None] = None
+        self.stop_usage: Union[ResourceUsage, None] = None
+        #: Resource usage growth of the server process during each test.
+        self.usage_by_test: Dict[str, ResourceUsage] = {}
+        #: The scope of the fixture which created the server, if any.
+        self.scope: Union[str, None] = None
+        #: Seconds taken to start (until ready and warmed up) and to stop.
+        self.start_duration: Union[float, None] = None
+        self.stop_duration: Union[float, None] = None
+        #: Why the server failed to start, if it did.
+        self.failure: Union[str, None] = None
+        self._spawned_at: Union[float, None] = None
+        self._access_log: List[AccessRecord] = []
+        self._access_log_conn: Union[Connection, None] = None
 
     def start(self) -> None:
         """Start application in a separate process."""
+        self._spawn()
+        self._wait_until_ready(time.time())
+
+    def _spawn(self) -> None:
+        self._spawned_at = time.perf_counter()
+        if self.reuse_file is not None:
+            import fcntl
+
+            # Only one pytest-xdist worker starts a shared server
+            with open(self.reuse_file + ".lock", "w") as lock:
+                fcntl.lockf(lock, fcntl.LOCK_EX)
+                if self._attach():
+                    return
+                self._spawn_detached()
+                _write_reuse_file(
+                    self.reuse_file,
+                    {
+                        "host": self.host,
+                        "port": self.port,
+                        "pid": self._detached_pid,
+                        "fingerprint": self.fingerprint(),
+                    },
+                )
+            return
 
-        def worker(app: _SupportsFlaskAppRun, host: str, port: int) -> None:
-            app.run(host=host, port=port, use_reloader=False, threaded=True)
+        child_conn = None
+        if self.access_log_mode == "capture":
+            self._access_log_conn, child_conn = multiprocessing.Pipe()
 
         self._process = multiprocessing.Process(
-            target=worker, args=(self.app, self.host, self.port)
+            target=_serve_app,
+            args=(
+                self.app,
+                self.host,
+                self.port,
+                self.access_log_mode,
+                child_conn,
+                self.profile_dir,
+                self._serve,
+                self.clock,
+            ),
         )
         self._process.daemon = True
         self._process.start()
+        if child_conn is not None:
+            child_conn.close()
 
-        keep_trying: bool = True
-        start_time = time.time()
-        while keep_trying:
-            elapsed_time = time.time() - start_time
-            if elapsed_time > self.wait:
-                pytest.fail(
+    @property
+    def pid(self) -> Union[int, None]:
+        """The pid of the server process, if started."""
+        if self._process is not None:
+            return self._process.pid
+        return self._detached_pid
+
+    def fingerprint(self) -> str:
+        """A hash of the source files of the application, of the modules
+        imported from its root path and of its views, of its config and of
+        the server options, telling whether a server left running by a
+        previous run serves the same application."""
+        digest = hashlib.sha256()
+        digest.update(repr((self.host, self.backend)).encode())
+        app: Any = self.app
+        # The port in SERVER_NAME is only known once the server is attached
+        config = {k: v for k, v in app.config.items() if k != "SERVER_NAME"}
+        digest.update(config_fingerprint(config).encode())
+        filenames = set()
+        module_file = getattr(sys.modules.get(app.import_name), "__file__", None)
+        if module_file:
+            filenames.add(module_file)
+        # Helpers imported by the views, wherever they are defined
+        root = os.path.join(os.path.abspath(app.root_path), "")
+        for module in list(sys.modules.values()):
+            filename = getattr(module, "__file__", None)
+            if filename and os.path.abspath(filename).startswith(root):
+                filenames.add(filename)
+        for view in app.view_functions.values():
+            target = inspect.unwrap(getattr(view, "view_class", view))
+            try:
+                filenames.add(inspect.getsourcefile(target))
+            except TypeError:
+                pass
+        for filename in sorted(name for name in filenames if name):
+            digest.update(filename.encode())
+            try:
+                with open(filename, "rb") as f:
+                    digest.update(hashlib.sha256(f.read()).digest())
+            except OSError:
+                pass
+        return digest.hexdigest()
+
+    def _attach(self) -> bool:
+        """Use the server started by a previous session or by another
+        pytest-xdist worker if it serves the same application, otherwise stop
+        it. The port of the server is kept.
+
+        :return: True if the server is reused.
+        """
+        state = read_reuse_file(cast(str, self.reuse_file))
+        if state is None or not _pid_exists(state["pid"]):
+            return False
+        if (state["fingerprint"], state["host"]) == (self.fingerprint(), self.host):
+            if state["port"] != self.port:
+                self.port = state["port"]
+                server_name = self.app.config.get(  # type: ignore[attr-defined]
+                    "SERVER_NAME"
+                )
+                if server_name:
+                    self.app.config["SERVER_NAME"] = (  # type: ignore[attr-defined]
+                        _rewrite_server_name(server_name, str(self.port))
+                    )
+            self._detached_pid = state["pid"]
+            self.reused = True
+            # Keep the server alive for another idle period
+            os.utime(cast(str, self.reuse_file))
+            return True
+
+        os.kill(state["pid"], signal.SIGTERM)
+        deadline = time.time() + self.wait
+        while _pid_exists(state["pid"]) and time.time() < deadline:
+            time.sleep(0.01)
+        return False
+
+    def _spawn_detached(self) -> None:
+        """Start the server in a process outliving the test session, which
+        stops once :attr:`reuse_file` is deleted, is taken over by another
+        server or wasn't used for ``_REUSE_IDLE_TIMEOUT`` seconds."""
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover
+            os.close(read_fd)
+            os.setsid()
+            if os.fork():
+                os._exit(0)
+            try:
+                os.write(write_fd, str(os.getpid()).encode())
+                os.close(write_fd)
+                log_fd = os.open(
+                    cast(str, self.reuse_file) + ".log",
+                    os.O_WRONLY | os.O_CREAT | os.O_TRUNC,
+                )
+                null_fd = os.open(os.devnull, os.O_RDONLY)
+                os.dup2(null_fd, 0)
+                os.dup2(log_fd, 1)
+                os.dup2(log_fd, 2)
+                _close_inherited_pipes()
+                threading.Thread(
+                    target=_watch_reuse_file,
+                    args=(cast(str, self.reuse_file), os.getpid()),
+                    daemon=True,
+                ).start()
+                _serve_app(
+                    self.app,
+                    self.host,
+                    self.port,
+                    self.access_log_mode,
+                    None,
+                    None,
+                    self._serve,
+                )
+            finally:
+                os._exit(0)
+
+        os.close(write_fd)
+        os.waitpid(pid, 0)
+        with os.fdopen(read_fd) as f:
+            self._detached_pid = int(f.read())
+
+    def _wait_until_ready(self, start_time: float) -> None:
+        # Probe with an exponential backoff with full jitter, so that waiting
+        # for several servers doesn't hog the CPU they need to start
+        attempt = 0
+        while True:
+            ready, reason = self._probe()
+            if ready:
+                break
+            remaining = start_time + self.wait - time.time()
+            if remaining <= 0:
+                self._fail(
                     "Failed to start the server after {!s} "
-                    "seconds.".format(self.wait)
+                    "seconds{}.".format(self.wait, f" ({reason})" if reason else "")
                 )
-            if self._is_ready():
-                keep_trying = False
+            delay = min(_READY_BACKOFF_MAX, _READY_BACKOFF_BASE * 2**attempt)
+            time.sleep(min(remaining, random.uniform(0, delay)))
+            attempt += 1
+        if not self.reused:
+            self._warm_up()
+        if self._spawned_at is not None:
+            self.start_duration = time.perf_counter() - self._spawned_at
+        self.start_usage = self.resource_usage()
+
+    def _fail(self, reason: str) -> NoReturn:
+        self.failure = reason
+        pytest.fail(reason)
+
+    def _probe(self) -> Tuple[bool, str]:
+        """Tell whether the server accepts connections and, if
+        :attr:`health_url` is set, whether it responds successfully to it.
+
+        :return: ``(ready, reason)``, where ``reason`` explains why the
+                 server isn't ready yet, if known.
+        """
+        if self.health_url is None:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            try:
+                sock.connect((self.host, self.port))
+            except OSError:
+                return False, ""
+            finally:
+                sock.close()
+            return True, ""
 
-    def _is_ready(self) -> bool:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         try:
-            sock.connect((self.host, self.port))
-        except OSError:
-            ret = False
-        else:
-            ret = True
+            status = self._request(self.health_url)
+        except OSError as e:
+            return False, f"GET {self.health_url}: {e}"
+        return 200 <= status < 400, f"GET {self.health_url}: {status}"
+
+    def _request(self, path: str) -> int:
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=self.wait)
+        try:
+            conn.request("GET", path)
+            response = conn.getresponse()
+            response.read()
+            return response.status
         finally:
-            sock.close()
-        return ret
+            conn.close()
+
+    def _warm_up(self) -> None:
+        """Request every :attr:`warmup` path, to prime the caches of the
+        application."""
+        for path in self.warmup:
+            try:
+                status = self._request(path)
+            except OSError as e:
+                self._fail(f"Failed to warm up the server: GET {path}: {e}.")
+            if status >= 500:
+                self._fail(f"Failed to warm up the server: GET {path}: {status}.")
+
+    def resource_usage(self) -> Union[ResourceUsage, None]:
+        """Sample the current resource usage of the server process.
+
+        :return: ``None`` if the server isn't running or resource usage
+                 isn't available on this platform.
+        """
+        if self.pid is None:
+            return None
+        return sample_process(self.pid)
+
+    @property
+    def access_log(self) -> List[AccessRecord]:
+        """Requests served by the live server so far, when it has been
+        started with ``access_log="capture"``."""
+        self._receive_access_log()
+        return list(self._access_log)
+
+    def clear_access_log(self) -> None:
+        """Forget requests served so far."""
+        self._receive_access_log()
+        self._access_log = []
+
+    def _receive_access_log(self, timeout: float = 5) -> None:
+        """Ask the server process for the records of the requests served
+        since the last call."""
+        conn = self._access_log_conn
+        if conn is None:
+            return
+        try:
+            conn.send(True)
+            # Also read the answers to earlier flushes which timed out
+            ready = conn.poll(timeout)
+            while ready:
+                _, records = conn.recv()
+                self._access_log.extend(records)
+                ready = conn.poll(0)
+        except (EOFError, OSError):
+            self._access_log_conn = None
 
     def url(self, url: str = "") -> str:
         """Returns the complete url based on server options."""
@@ -100,12 +943,33 @@ class LiveServer:  # pragma: no cover
 
     def stop(self) -> None:
         """Stop application process."""
+        start = time.perf_counter()
+        try:
+            self._stop()
+        finally:
+            self.stop_duration = time.perf_counter() - start
+
+    def _stop(self) -> None:
+        if self.stop_usage is None:
+            self.stop_usage = self.resource_usage()
+        if self.reuse_file is not None:
+            # Leave the server running for the next session
+            if os.path.exists(self.reuse_file):
+                os.utime(self.reuse_file)
+            return
+        self._receive_access_log(timeout=1)
+        if self._access_log_conn is not None:
+            self._access_log_conn.close()
+            self._access_log_conn = None
         if self._process:
             if self.clean_stop and self._stop_cleanly():
                 return
             if self._process.is_alive():
                 # If it's still alive, kill it
                 self._process.terminate()
+                if self.profile_dir is not None:
+                    # Wait for the profiling stats to be written
+                    self._process.join(self.wait)
 
     def _stop_cleanly(self, timeout: int = 5) -> bool:
         """Attempts to stop the server cleanly by sending a SIGINT
@@ -126,3 +990,22 @@ class LiveServer:  # pragma: no cover
 
     def __repr__(self):
         return "<LiveServer listening at %s>" % self.url()
+
+
+def start_live_servers(servers: Sequence[LiveServer]) -> None:
+    """Start ``servers`` concurrently and wait until all of them are ready,
+    so that starting them takes as long as the slowest one."""
+    for server in servers:
+        server._spawn()
+    start_time = time.time()
+    for server in servers:
+        server._wait_until_ready(start_time)
+
+
+def stop_live_servers(servers: Sequence[LiveServer]) -> None:
+    """Stop ``servers`` concurrently."""
+    if not servers:
+        return
+    with ThreadPoolExecutor(max_workers=len(servers)) as executor:
+        for future in [executor.submit(server.stop) for server in servers]:
+            future.result()
@@ -0,0 +1,227 @@
+import bisect
+import http.client
+import math
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import cast
+from typing import Dict
+from typing import List
+from typing import Sequence
+from typing import Tuple
+from typing import Union
+
+from .live_server import LiveServer
+
+
+LOAD_MODELS = ("closed", "open")
+
+#: Default upper bounds (in seconds) of the latency histogram buckets.
+HISTOGRAM_BOUNDS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+class LoadReport:
+    """The result of a :meth:`LiveLoad.run`.
+
+    :param latencies: The latency of every completed request, in seconds.
+    :param statuses: The number of responses per HTTP status code.
+    :param failures: The number of requests which got no response.
+    :param duration: The wall clock duration of the run, in seconds.
+    """
+
+    def __init__(
+        self,
+        latencies: Sequence[float],
+        statuses: Dict[int, int],
+        failures: int,
+        duration: float,
+    ):
+        self.latencies = sorted(latencies)
+        self.statuses = dict(statuses)
+        self.failures = failures
+        self.duration = duration
+
+    @property
+    def requests(self) -> int:
+        """The number of requests sent."""
+        return sum(self.statuses.values()) + self.failures
+
+    @property
+    def errors(self) -> int:
+        """The number of failed requests and server errors."""
+        server_errors = sum(n for code, n in self.statuses.items() if code >= 500)
+        return self.failures + server_errors
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.requests if self.requests else 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Completed requests per second."""
+        return len(self.latencies) / self.duration if self.duration else 0.0
+
+    def percentile(self, percent: float) -> float:
+        """Return the latency below which ``percent`` % of requests fall."""
+        if not self.latencies:
+            return math.nan
+        rank = math.ceil(percent / 100 * len(self.latencies)) - 1
+        return self.latencies[min(max(rank, 0), len(self.latencies) - 1)]
+
+    def histogram(
+        self, bounds: Sequence[float] = HISTOGRAM_BOUNDS
+    ) -> List[Tuple[float, int]]:
+        """Return ``(upper_bound, count)`` pairs of the latency histogram, the
+        last bucket being unbounded (``math.inf``)."""
+        upper_bounds = [*sorted(bounds), math.inf]
+        counts = [0] * len(upper_bounds)
+        for latency in self.latencies:
+            counts[bisect.bisect_left(upper_bounds, latency)] += 1
+        return [(bound, counts[i]) for i, bound in enumerate(upper_bounds)]
+
+    def __repr__(self):
+        return "<LoadReport %d requests, %.1f req/s, p50=%.4fs, %d errors>" % (
+            self.requests,
+            self.throughput,
+            self.percentile(50),
+            self.errors,
+        )
+
+
+class LiveLoad:
+    """The helper class used to generate HTTP load against a live server
+    with a pool of threads.
+
+    :param live_server: The live server to send requests to.
+    """
+
+    def __init__(self, live_server: LiveServer):
+        self.live_server = live_server
+        self._local = threading.local()
+        self._connections: List[http.client.HTTPConnection] = []
+
+    def run(
+        self,
+        url: str = "",
+        method: str = "GET",
+        body: Union[bytes, None] = None,
+        headers: Union[Dict[str, str], None] = None,
+        concurrency: int = 4,
+        duration: float = 1.0,
+        rps: Union[float, None] = None,
+        model: str = "closed",
+        timeout: float = 5,
+    ) -> LoadReport:
+        """Send requests to ``url`` for ``duration`` seconds.
+
+        In the ``closed`` model ``concurrency`` clients send a new request as
+        soon as they get a response, optionally throttled to ``rps`` requests
+        per second in total. In the ``open`` model requests are sent at a
+        fixed rate of ``rps`` requests per second regardless of responses,
+        by at most ``concurrency`` threads; latencies are measured from the
+        scheduled start of each request, so a saturated server shows up as
+        growing latencies.
+        """
+        if model not in LOAD_MODELS:
+            raise ValueError(f"unknown load model {model!r}")
+        if model == "open" and not rps:
+            raise ValueError("the open load model requires 'rps'")
+
+        request = (method, url, body, dict(headers or {}), timeout)
+        results: List[Tuple[Union[int, None], float]] = []
+        start_time = time.perf_counter()
+        deadline = start_time + duration
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            if model == "closed":
+                interval = concurrency / rps if rps else 0.0
+                for worker in range(concurrency):
+                    executor.submit(
+                        self._closed_worker,
+                        request,
+                        start_time + worker * interval / concurrency,
+                        interval,
+                        deadline,
+                        results,
+                    )
+            else:
+                interval = 1 / cast(float, rps)
+                scheduled = start_time
+                while scheduled < deadline:
+                    delay = scheduled - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                    executor.submit(self._send, request, scheduled, results)
+                    scheduled += interval
+        elapsed = time.perf_counter() - start_time
+        while self._connections:
+            self._connections.pop().close()
+
+        statuses: Dict[int, int] = Counter()
+        failures = 0
+        latencies = []
+        for status, latency in results:
+            if status is None:
+                failures += 1
+            else:
+                statuses[status] += 1
+                latencies.append(latency)
+        return LoadReport(latencies, statuses, failures, elapsed)
+
+    def _closed_worker(
+        self,
+        request: Tuple[Any, ...],
+        scheduled: float,
+        interval: float,
+        deadline: float,
+        results: List[Tuple[Union[int, None], float]],
+    ) -> None:
+        while scheduled < deadline:
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            self._send(request, time.perf_counter(), results)
+            scheduled = max(scheduled + interval, time.perf_counter())
+
+    def _send(
+        self,
+        request: Tuple[Any, ...],
+        scheduled: float,
+        results: List[Tuple[Union[int, None], float]],
+    ) -> None:
+        method, url, body, headers, timeout = request
+        try:
+            conn = self._connection(timeout)
+            conn.request(method, url or "/", body=body, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            if response.will_close:
+                self._close_connection()
+            status: Union[int, None] = response.status
+        except (OSError, http.client.HTTPException):
+            self._close_connection()
+            status = None
+        # ``list.append`` is atomic, no lock needed
+        results.append((status, time.perf_counter() - scheduled))
+
+    def _connection(self, timeout: float) -> http.client.HTTPConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = http.client.HTTPConnection(
+                self.live_server.host, self.live_server.port, timeout=timeout
+            )
+            self._local.conn = conn
+            self._connections.append(conn)
+        return conn
+
+    def _close_connection(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._connections.remove(conn)
+            self._local.conn = None
+
+    def __repr__(self):
+        return "<LiveLoad against %s>" % self.live_server.url()
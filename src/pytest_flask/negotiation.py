@@ -0,0 +1,76 @@
+from io import BytesIO
+from typing import Any
+from typing import Iterator
+from typing import List
+from typing import Sequence
+from typing import Tuple
+
+from werkzeug.test import EnvironBuilder
+from werkzeug.wrappers import Request
+
+from ._internal import _make_accept_matrix
+
+
+_Headers = List[Tuple[str, str]]
+
+
+class AcceptMatrix:
+    """The helper class used to run a view across a content negotiation
+    matrix. Header sets are generated once for every distinct combination of
+    ``mimetypes``, ``charsets`` and ``encodings``.
+
+    :param mimetypes: The values of the ``Accept`` header.
+    :param charsets: The values of the ``Accept-Charset`` header.
+    :param encodings: The values of the ``Accept-Encoding`` header.
+    """
+
+    def __init__(
+        self,
+        mimetypes: Sequence[str],
+        charsets: Sequence[str] = (),
+        encodings: Sequence[str] = (),
+    ):
+        self.mimetypes = tuple(mimetypes)
+        self.charsets = tuple(charsets)
+        self.encodings = tuple(encodings)
+        self.headers = _make_accept_matrix(
+            self.mimetypes, self.charsets, self.encodings
+        )
+
+    def __iter__(self) -> Iterator[_Headers]:
+        return (list(headers) for headers in self.headers)
+
+    def __len__(self) -> int:
+        return len(self.headers)
+
+    def run(self, client: Any, *args: Any, **kwargs: Any) -> List[Tuple[_Headers, Any]]:
+        """Open the same request with every header set of the matrix and
+        return a list of ``(headers, response)`` pairs. Arguments are the
+        same as for :meth:`werkzeug.test.EnvironBuilder`.
+
+        The WSGI environ and the request body are built only once and then
+        copied for each header set::
+
+            def test_negotiation(client, accept_matrix):
+                for headers, res in accept_matrix.run(client, '/ping'):
+                    assert res.status_code == 200
+        """
+        builder = EnvironBuilder(*args, **kwargs)
+        try:
+            environ = builder.get_environ()
+        finally:
+            builder.close()
+        body = environ["wsgi.input"].read()
+
+        results = []
+        for headers in self.headers:
+            request_environ = dict(environ)
+            request_environ["wsgi.input"] = BytesIO(body)
+            for name, value in headers:
+                key = "HTTP_" + name.upper().replace("-", "_")
+                request_environ[key] = value
+            results.append((list(headers), client.open(Request(request_environ))))
+        return results
+
+    def __repr__(self):
+        return "<AcceptMatrix of %d header sets>" % len(self)
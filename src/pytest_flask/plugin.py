@@ -5,7 +5,15 @@
     :copyright: (c) by Vital Kudzelka
     :license: MIT
 """
+import contextlib
+import json
+import os
+import shutil
+import signal
+import tempfile
+import time
 from typing import Any
+from typing import Dict
 from typing import List
 from typing import Protocol
 from typing import Type
@@ -15,15 +23,47 @@ from typing import Union
 import pytest
 from _pytest.config import Config as _PytestConfig
 
+from ._internal import _accept_matrix_id
+from ._internal import _accept_matrix_options
+from ._internal import _ACCESS_LOG_MODES
+from ._internal import _flask_allocations_key
+from ._internal import _flask_durations_key
+from ._internal import _LIVE_SERVER_RECORDS
+from ._internal import _live_server_records_key
+from ._internal import _live_servers_key
+from ._internal import _make_accept_matrix
+from ._internal import _PROFILE_DIR_KEY
+from ._internal import _profile_dir_key
+from ._internal import _REPLAY_MODES
+from ._internal import _setup_timer_key
+from ._internal import _SHARED_DIR_KEY
+from ._internal import _shared_dir_key
+from ._internal import _STARTUP_CACHE_KEY
+from ._internal import _startup_history_key
+from ._internal import _STARTUP_HISTORY_SIZE
+from ._internal import _TIMED_FIXTURES
+from ._internal import _virtual_clock_used_key
+from .fixtures import _compile_app_templates
 from .fixtures import accept_any
 from .fixtures import accept_json
 from .fixtures import accept_jsonp
+from .fixtures import accept_matrix
 from .fixtures import accept_mimetype
 from .fixtures import client
 from .fixtures import client_class
+from .fixtures import concurrent_client
 from .fixtures import config
+from .fixtures import flask_allocations
+from .fixtures import flask_benchmark
+from .fixtures import live_load
 from .fixtures import live_server
+from .fixtures import live_servers
+from .fixtures import shared_datasets
+from .fixtures import streaming_client
+from .fixtures import virtual_clock
 from .pytest_compat import getfixturevalue
+from .resources import _format_usage
+from .resources import ResourceUsage
 
 
 _Response = TypeVar("_Response")
@@ -101,6 +141,17 @@ def _monkeypatch_response_class(request, monkeypatch):
     )
 
 
+@pytest.fixture(autouse=True)
+def _compile_templates(request):
+    """With ``--flask-template-cache``, compile the templates of the
+    application once, before the first test using it renders them or forks a
+    live server, with their bytecode cached on disk between sessions."""
+    if "app" not in request.fixturenames:
+        return
+    if request.config.getvalue("flask_template_cache"):
+        _compile_app_templates(request.config, getfixturevalue(request, "app"))
+
+
 @pytest.fixture(autouse=True)
 def _push_request_context(request):
     """During tests execution request context has been pushed, e.g. `url_for`,
@@ -150,6 +201,182 @@ def _configure_application(request, monkeypatch):
             monkeypatch.setitem(app.config, key.upper(), value)
 
 
+@pytest.fixture(autouse=True)
+def _track_live_server(request):
+    """Start every test with an empty ``live_server.access_log`` and record
+    the resource usage growth of the live server process during the test,
+    even when the live server is shared between tests. The same applies to
+    each server of ``live_servers``. With ``--flask-changed``, the views
+    found in the captured access log are recorded for the test.
+
+    The test fails if the growth exceeds ``--live-server-max-rss-growth`` or
+    ``--live-server-max-fd-growth``.
+    """
+    servers = []
+    if "live_server" in request.fixturenames:
+        servers.append(getfixturevalue(request, "live_server"))
+    if "live_servers" in request.fixturenames:
+        servers.extend(getfixturevalue(request, "live_servers").values())
+
+    selector = request.config.pluginmanager.get_plugin("flask_changed")
+    before = []
+    for server in servers:
+        if selector is not None and server.access_log_mode == "capture":
+            selector.track(request.node.nodeid)
+        server.clear_access_log()
+        before.append((server, server.resource_usage()))
+
+    yield
+
+    errors = []
+    for server, start_usage in before:
+        if selector is not None:
+            for record in server.access_log:
+                selector.observe_path(
+                    request.node.nodeid, server.app, record.method, record.path
+                )
+        end_usage = server.resource_usage()
+        if start_usage is None or end_usage is None:
+            continue
+        growth = end_usage.since(start_usage)
+        server.usage_by_test[request.node.nodeid] = growth
+        errors.extend(_resource_growth_errors(request.config, server, growth))
+    if errors:
+        pytest.fail("\n".join(errors))
+
+
+def _resource_growth_errors(config, server, growth) -> List[str]:
+    errors = []
+    max_rss = config.getvalue("live_server_max_rss_growth")
+    if max_rss is not None and growth.rss > max_rss:
+        errors.append(
+            "Live server {} RSS grew by {} bytes during the test "
+            "(limit {}).".format(server.url(), growth.rss, max_rss)
+        )
+    max_fds = config.getvalue("live_server_max_fd_growth")
+    if max_fds is not None and growth.fds > max_fds:
+        errors.append(
+            "Live server {} open file descriptors grew by {} during the test "
+            "(limit {}).".format(server.url(), growth.fds, max_fds)
+        )
+    return errors
+
+
+class _SetupTimer:
+    """Setup durations of the timed fixtures of a test, excluding the setup
+    of the timed fixtures they request."""
+
+    def __init__(self):
+        self.durations: Dict[str, float] = {}
+        self._nested: List[float] = []
+
+    @contextlib.contextmanager
+    def time(self, name: str):
+        self._nested.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            own = elapsed - self._nested.pop()
+            if self._nested:
+                self._nested[-1] += elapsed
+            self.durations[name] = self.durations.get(name, 0.0) + own
+
+
+class _ReportCollector:
+    """Plugin collecting the user properties of test reports, also sent by
+    pytest-xdist workers, which are summarized at the end of the session."""
+
+    def __init__(self, config: _PytestConfig):
+        self.config = config
+
+    def pytest_runtest_logreport(self, report) -> None:
+        if report.when != "teardown":
+            return
+        stash = self.config.stash
+        for name, value in report.user_properties:
+            if name == "flask_durations":
+                stash.setdefault(_flask_durations_key, []).extend(
+                    (report.nodeid, fixture, duration)
+                    for fixture, duration in value.items()
+                )
+            elif name == "flask_allocations":
+                totals = stash.setdefault(_flask_allocations_key, {})
+                for endpoint, count, peak, net in value:
+                    total = totals.setdefault(endpoint, [0, 0, 0, ""])
+                    total[0] += count
+                    if peak > total[1]:
+                        total[1] = peak
+                        total[3] = report.nodeid
+                    total[2] = max(total[2], net)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_setup(item):
+    """Collect the setup duration of the fixtures of pytest-flask, and of the
+    ``app`` fixture, in the ``flask_durations`` user property of the test
+    when ``--flask-durations`` is used."""
+    if item.config.getvalue("flask_durations") is None:
+        yield
+        return
+
+    timer = _SetupTimer()
+    item.config.stash[_setup_timer_key] = timer
+    try:
+        yield
+    finally:
+        del item.config.stash[_setup_timer_key]
+        item.user_properties.append(("flask_durations", timer.durations))
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_fixture_setup(fixturedef, request):
+    timer = request.config.stash.get(_setup_timer_key, None)
+    if timer is None or fixturedef.argname not in _TIMED_FIXTURES:
+        yield
+        return
+
+    with timer.time(fixturedef.argname):
+        yield
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(config, items):
+    """Tell live servers whether they need the virtual clock, before any of
+    them starts."""
+    config.stash[_virtual_clock_used_key] = any(
+        "virtual_clock" in getattr(item, "fixturenames", ()) for item in items
+    )
+
+
+def pytest_generate_tests(metafunc):
+    """Parametrize the ``accept_headers`` argument with every header set of
+    the ``accept_matrix`` marker::
+
+        @pytest.mark.accept_matrix(mimetypes=['application/json'],
+                                   encodings=['gzip', 'identity'])
+        def test_negotiation(client, accept_headers):
+            assert client.get(url_for('ping'), headers=accept_headers) == 200
+
+    """
+    if "accept_headers" not in metafunc.fixturenames:
+        return
+
+    marker = metafunc.definition.get_closest_marker("accept_matrix")
+    if marker is None and "accept_headers" in metafunc._arg2fixturedefs:
+        # The project's own accept_headers fixture
+        return
+
+    # Without the marker, the default mimetypes of the matrix are used
+    matrix = _make_accept_matrix(*_accept_matrix_options(marker))
+    metafunc.parametrize(
+        "accept_headers",
+        [list(headers) for headers in matrix],
+        ids=[_accept_matrix_id(headers) for headers in matrix],
+    )
+
+
 def pytest_addoption(parser):
     group = parser.getgroup("flask")
     group.addoption(
@@ -175,6 +402,14 @@ def pytest_addoption(parser):
         help="the timeout after which test case is aborted if live server is "
         " not started.",
     )
+    group.addoption(
+        "--live-server-adaptive-wait",
+        action="store_true",
+        dest="live_server_adaptive_wait",
+        default=False,
+        help="derive the live server wait timeout from the startup times of "
+        "previous sessions, bounded by --live-server-wait.",
+    )
     group.addoption(
         "--live-server-clean-stop",
         action="store_true",
@@ -202,6 +437,184 @@ def pytest_addoption(parser):
         type=int,
         help="use a fixed port for the live_server fixture.",
     )
+    group.addoption(
+        "--live-server-health-url",
+        action="store",
+        dest="live_server_health_url",
+        default=None,
+        metavar="PATH",
+        help="consider the live server started once it responds to PATH with "
+        "a 2xx or 3xx status, rather than once it accepts connections.",
+    )
+    group.addoption(
+        "--live-server-warmup",
+        action="append",
+        dest="live_server_warmup",
+        default=None,
+        metavar="PATH",
+        help="request PATH once the live server is started, before tests use "
+        "it (may be repeated).",
+    )
+    group.addoption(
+        "--live-server-reuse",
+        action="store_true",
+        dest="live_server_reuse",
+        default=False,
+        help="leave the live server running after the session and reuse it "
+        "in later sessions, until the application source changes.",
+    )
+    group.addoption(
+        "--live-server-shared",
+        action="store_true",
+        dest="live_server_shared",
+        default=False,
+        help="share the live server of each application between the "
+        "pytest-xdist workers.",
+    )
+    group.addoption(
+        "--live-server-access-log",
+        action="store",
+        dest="live_server_access_log",
+        default="stderr",
+        choices=_ACCESS_LOG_MODES,
+        help="where the live server access log goes: 'stderr' (default), "
+        "'capture' to collect it in live_server.access_log, or 'off'.",
+    )
+    group.addoption(
+        "--live-server-profile",
+        action="store",
+        dest="live_server_profile",
+        default=None,
+        metavar="DIR",
+        help="profile requests served by the live server and write "
+        "per-endpoint pstats files to DIR when it is stopped.",
+    )
+    group.addoption(
+        "--live-server-backend",
+        action="store",
+        dest="live_server_backend",
+        default="dev",
+        metavar="BACKEND",
+        help="server used by the live server: 'dev' (werkzeug development "
+        "server, default), 'threadpool' (fixed thread pool with keep-alive "
+        "connections) or a 'module:function' import path.",
+    )
+    group.addoption(
+        "--live-server-resources",
+        action="store_true",
+        dest="live_server_resources",
+        default=False,
+        help="report live server process resource usage in the terminal "
+        "summary (Linux only).",
+    )
+    group.addoption(
+        "--live-server-summary",
+        action="store_true",
+        dest="live_server_summary",
+        default=False,
+        help="summarize the start, stop and failures of the live servers of "
+        "the session, across pytest-xdist workers, in the terminal summary.",
+    )
+    group.addoption(
+        "--live-server-summary-json",
+        action="store",
+        dest="live_server_summary_json",
+        default=None,
+        metavar="PATH",
+        help="write the start, stop and failures of the live servers of the "
+        "session to PATH as JSON.",
+    )
+    group.addoption(
+        "--live-server-max-rss-growth",
+        action="store",
+        dest="live_server_max_rss_growth",
+        default=None,
+        type=int,
+        metavar="BYTES",
+        help="fail tests during which the live server RSS grows by more "
+        "than BYTES (Linux only).",
+    )
+    group.addoption(
+        "--live-server-max-fd-growth",
+        action="store",
+        dest="live_server_max_fd_growth",
+        default=None,
+        type=int,
+        metavar="N",
+        help="fail tests during which the live server opens more than N "
+        "file descriptors without closing them (Linux only).",
+    )
+    group.addoption(
+        "--flask-replay",
+        action="store",
+        dest="flask_replay",
+        default="off",
+        choices=_REPLAY_MODES,
+        help="replay responses recorded in the pytest cache for client "
+        "requests of tests marked with 'replay': 'off' (default), 'on' to "
+        "replay recorded responses and record missing ones, 'verify' to "
+        "compare recorded responses with fresh ones.",
+    )
+    group.addoption(
+        "--flask-durations",
+        action="store",
+        dest="flask_durations",
+        default=None,
+        type=int,
+        metavar="N",
+        help="show the N slowest setups of pytest-flask fixtures and of the "
+        "app fixture (N=0 for all).",
+    )
+    group.addoption(
+        "--flask-changed",
+        action="store_true",
+        dest="flask_changed",
+        default=False,
+        help="only run tests which requested a view whose source changed "
+        "since they last passed, and tests not run with this option before.",
+    )
+    group.addoption(
+        "--flask-template-cache",
+        action="store_true",
+        dest="flask_template_cache",
+        default=False,
+        help="compile the templates of each application once per session, "
+        "and cache their bytecode in the pytest cache for later sessions and "
+        "live server processes.",
+    )
+    group.addoption(
+        "--flask-allocations",
+        action="store_true",
+        dest="flask_allocations",
+        default=False,
+        help="trace the memory allocated by the requests of the client "
+        "fixture and report the largest allocations per endpoint.",
+    )
+    group.addoption(
+        "--flask-benchmark-save",
+        action="store_true",
+        dest="flask_benchmark_save",
+        default=False,
+        help="save the results of flask_benchmark as the baseline of later " "runs.",
+    )
+    group.addoption(
+        "--flask-benchmark-tolerance",
+        action="store",
+        dest="flask_benchmark_tolerance",
+        default=0.2,
+        type=float,
+        metavar="FRACTION",
+        help="fail flask_benchmark tests whose median is slower than their "
+        "baseline by more than FRACTION (default 0.2).",
+    )
+    group.addoption(
+        "--flask-benchmark-json",
+        action="store",
+        dest="flask_benchmark_json",
+        default=None,
+        metavar="PATH",
+        help="write the results of flask_benchmark to PATH as JSON.",
+    )
     parser.addini(
         "live_server_scope",
         "modify the scope of the live_server fixture.",
@@ -214,3 +627,294 @@ def pytest_configure(config: _PytestConfig) -> None:
         "markers", "app(options): pass options to your application factory"
     )
     config.addinivalue_line("markers", "options: app config manipulation")
+    config.addinivalue_line(
+        "markers",
+        "accept_matrix(mimetypes, charsets, encodings): "
+        "content negotiation matrix for accept_matrix and accept_headers",
+    )
+    config.addinivalue_line(
+        "markers",
+        "replay(headers): replay recorded responses of deterministic "
+        "endpoints requested with the client fixture (see --flask-replay)",
+    )
+    config.addinivalue_line(
+        "markers",
+        "flask_benchmark(**kwargs): parameters of the flask_benchmark fixture, "
+        "e.g. max_time, min_rounds, disable_gc or tolerance",
+    )
+    if config.getvalue("flask_changed") and getattr(config, "cache", None):
+        from .selection import ChangedViewsSelector
+
+        config.pluginmanager.register(
+            ChangedViewsSelector(config.cache), "flask_changed"
+        )
+    if config.getvalue("flask_template_cache") and not getattr(config, "cache", None):
+        raise pytest.UsageError(
+            "--flask-template-cache needs the cacheprovider plugin."
+        )
+    if config.getvalue("live_server_profile") is not None:
+        workerinput = getattr(config, "workerinput", None)
+        if workerinput is None:
+            profile_dir = tempfile.mkdtemp(prefix="pytest-flask-profile-")
+        else:
+            profile_dir = workerinput[_PROFILE_DIR_KEY]
+        config.stash[_profile_dir_key] = profile_dir
+    if not hasattr(config, "workerinput"):
+        from .benchmark import BenchmarkReport
+
+        config.pluginmanager.register(BenchmarkReport(config), "flask_benchmark")
+        config.pluginmanager.register(_ReportCollector(config), "flask_reports")
+    if config.getvalue("live_server_shared") and not hasattr(config, "workerinput"):
+        config.stash[_shared_dir_key] = tempfile.mkdtemp(prefix="pytest-flask-")
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """Pass the directories of the shared live servers and of the profiling
+    stats to pytest-xdist workers."""
+    shared_dir = node.config.stash.get(_shared_dir_key, None)
+    if shared_dir is not None:
+        node.workerinput[_SHARED_DIR_KEY] = shared_dir
+    profile_dir = node.config.stash.get(_profile_dir_key, None)
+    if profile_dir is not None:
+        node.workerinput[_PROFILE_DIR_KEY] = profile_dir
+
+
+def pytest_unconfigure(config: _PytestConfig) -> None:
+    profile_dir = config.stash.get(_profile_dir_key, None)
+    if profile_dir is not None and not hasattr(config, "workerinput"):
+        from .live_server import merge_profiles
+
+        output_dir = config.invocation_params.dir / config.getvalue(
+            "live_server_profile"
+        )
+        merge_profiles(profile_dir, str(output_dir))
+        shutil.rmtree(profile_dir, ignore_errors=True)
+
+    shared_dir = config.stash.get(_shared_dir_key, None)
+    if shared_dir is None:
+        return
+
+    from .live_server import _pid_exists
+    from .live_server import read_reuse_file
+
+    for name in os.listdir(shared_dir):
+        state = read_reuse_file(os.path.join(shared_dir, name))
+        if state is not None and _pid_exists(state["pid"]):
+            os.kill(state["pid"], signal.SIGTERM)
+    shutil.rmtree(shared_dir, ignore_errors=True)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """Collect the live servers started by a pytest-xdist worker."""
+    records = getattr(node, "workeroutput", {}).get(_LIVE_SERVER_RECORDS, [])
+    node.config.stash.setdefault(_live_server_records_key, []).extend(records)
+
+
+def pytest_sessionfinish(session):
+    config = session.config
+    path = config.getvalue("live_server_summary_json")
+    adaptive_wait = config.getvalue("live_server_adaptive_wait") and getattr(
+        config, "cache", None
+    )
+    if (
+        not config.getvalue("live_server_summary")
+        and not config.getvalue("live_server_resources")
+        and path is None
+        and not adaptive_wait
+    ):
+        return
+
+    worker = getattr(config, "workerinput", {}).get("workerid", "main")
+    servers = config.stash.get(_live_servers_key, [])
+    records = [_live_server_record(server, worker) for server in servers]
+    if hasattr(config, "workeroutput"):
+        config.workeroutput[_LIVE_SERVER_RECORDS] = records
+        return
+
+    records = config.stash.setdefault(_live_server_records_key, []) + records
+    config.stash[_live_server_records_key] = records
+    if adaptive_wait:
+        _record_startup_durations(config, records)
+    if path is not None:
+        with open(config.invocation_params.dir / path, "w") as f:
+            json.dump({"live_servers": records}, f, indent=2)
+
+
+def _record_startup_durations(
+    config: _PytestConfig, records: List[Dict[str, Any]]
+) -> None:
+    """Add the startup durations of the live servers started by this session,
+    and its pytest-xdist workers, to their history in the pytest cache."""
+    records = [
+        record
+        for record in records
+        if record["start"] is not None and not record["reused"]
+    ]
+    if not records:
+        return
+    history = config.cache.get(_STARTUP_CACHE_KEY, {})
+    for record in records:
+        key = record["startup_history"]
+        durations = history.get(key, []) + [record["start"]]
+        history[key] = durations[-_STARTUP_HISTORY_SIZE:]
+    config.cache.set(_STARTUP_CACHE_KEY, history)
+
+
+def _live_server_record(server, worker: str) -> Dict[str, Any]:
+    largest_rss_growth = None
+    if server.usage_by_test:
+        nodeid, worst = max(server.usage_by_test.items(), key=lambda item: item[1].rss)
+        largest_rss_growth = [nodeid, worst.rss]
+    return {
+        "worker": worker,
+        "app": getattr(server.app, "import_name", repr(server.app)),
+        "url": server.url(),
+        "scope": server.scope,
+        "backend": server.backend,
+        "startup_history": _startup_history_key(server.app, server.backend),
+        "pid": server.pid,
+        "reused": server.reused,
+        "start": server.start_duration,
+        "stop": server.stop_duration,
+        "failure": server.failure,
+        "start_usage": None if server.start_usage is None else list(server.start_usage),
+        "stop_usage": None if server.stop_usage is None else list(server.stop_usage),
+        "largest_rss_growth": largest_rss_growth,
+    }
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    if config.getvalue("flask_durations") is not None:
+        _report_flask_durations(terminalreporter, config)
+    if config.getvalue("flask_allocations"):
+        _report_flask_allocations(terminalreporter, config)
+    if config.getvalue("live_server_resources"):
+        _report_live_server_resources(terminalreporter, config)
+    if config.getvalue("live_server_summary"):
+        _report_live_server_summary(terminalreporter, config)
+
+
+def _report_flask_durations(terminalreporter, config):
+    count = config.getvalue("flask_durations")
+    durations = config.stash.get(_flask_durations_key, [])
+    durations = sorted(durations, key=lambda entry: entry[2], reverse=True)
+    if count:
+        terminalreporter.write_sep("=", f"slowest {count} flask fixture setups")
+        durations = durations[:count]
+    else:
+        terminalreporter.write_sep("=", "slowest flask fixture setups")
+
+    hidden = 0
+    for nodeid, name, duration in durations:
+        if duration < 0.005 and config.option.verbose < 2:
+            hidden += 1
+            continue
+        terminalreporter.write_line(f"{duration:02.2f}s {name:<30} {nodeid}")
+    if hidden:
+        terminalreporter.write_line(
+            f"({hidden} durations < 0.005s hidden.  Use -vv to show these durations.)"
+        )
+
+    totals: Dict[str, List[float]] = {}
+    for _, name, duration in config.stash.get(_flask_durations_key, []):
+        totals.setdefault(name, []).append(duration)
+    if totals:
+        terminalreporter.write_line("")
+        terminalreporter.write_line("total per fixture:")
+    for name, values in sorted(totals.items(), key=lambda item: -sum(item[1])):
+        terminalreporter.write_line(
+            f"{sum(values):02.2f}s {name:<30} "
+            f"({len(values)} setups, max {max(values):.2f}s)"
+        )
+
+
+def _report_flask_allocations(terminalreporter, config):
+    totals = config.stash.get(_flask_allocations_key, {})
+    if not totals:
+        return
+
+    terminalreporter.write_sep("=", "flask allocations per endpoint")
+    terminalreporter.write_line(
+        f"{'max peak':>12} {'max net':>12} {'requests':>8}  endpoint (test of max peak)"
+    )
+    for endpoint, (count, peak, net, nodeid) in sorted(
+        totals.items(), key=lambda item: -item[1][1]
+    ):
+        terminalreporter.write_line(
+            f"{peak:>12} {net:>12} {count:>8}  {endpoint} ({nodeid})"
+        )
+
+
+def _report_live_server_resources(terminalreporter, config):
+    records = config.stash.get(_live_server_records_key, [])
+    records = [record for record in records if record["start_usage"] is not None]
+    if not records:
+        return
+
+    terminalreporter.write_sep("=", "live server resource usage")
+    for record in records:
+        terminalreporter.write_line(f"{record['url']}:")
+        start_usage = ResourceUsage(*record["start_usage"])
+        terminalreporter.write_line(f"  started: {_format_usage(start_usage)}")
+        if record["stop_usage"] is not None:
+            stop_usage = ResourceUsage(*record["stop_usage"])
+            terminalreporter.write_line(f"  stopped: {_format_usage(stop_usage)}")
+            growth = stop_usage.since(start_usage)
+            terminalreporter.write_line(f"  growth:  {_format_usage(growth, '+')}")
+        if record["largest_rss_growth"] is not None:
+            nodeid, rss = record["largest_rss_growth"]
+            terminalreporter.write_line(
+                f"  largest RSS growth: {nodeid} ({rss:+d} bytes)"
+            )
+
+
+def _report_live_server_summary(terminalreporter, config):
+    records = config.stash.get(_live_server_records_key, [])
+    if not records:
+        return
+
+    terminalreporter.write_sep("=", "live servers")
+    workers = {record["worker"] for record in records}
+    starts = [record["start"] for record in records if record["start"] is not None]
+    stops = [record["stop"] for record in records if record["stop"] is not None]
+    failures = [record for record in records if record["failure"] is not None]
+    reused = sum(record["reused"] for record in records)
+    terminalreporter.write_line(
+        f"{len(records)} live servers on {len(workers)} "
+        f"{'worker' if len(workers) == 1 else 'workers'}, "
+        f"{reused} reused, {len(failures)} failed to start"
+    )
+    if starts:
+        terminalreporter.write_line(
+            f"start: total {sum(starts):.2f}s, mean {sum(starts) / len(starts):.2f}s, "
+            f"max {max(starts):.2f}s"
+        )
+    if stops:
+        terminalreporter.write_line(
+            f"stop:  total {sum(stops):.2f}s, mean {sum(stops) / len(stops):.2f}s, "
+            f"max {max(stops):.2f}s"
+        )
+
+    scopes: Dict[str, int] = {}
+    for record in records:
+        scopes[record["scope"]] = scopes.get(record["scope"], 0) + 1
+    terminalreporter.write_line(
+        "per scope: "
+        + ", ".join(f"{scope} {count}" for scope, count in sorted(scopes.items()))
+    )
+
+    terminalreporter.write_line("")
+    for record in sorted(records, key=lambda record: -(record["start"] or 0)):
+        start = "-" if record["start"] is None else f"{record['start']:.2f}s"
+        stop = "-" if record["stop"] is None else f"{record['stop']:.2f}s"
+        line = (
+            f"{start:>7} {stop:>7} {record['scope']:<8} {record['worker']:<6} "
+            f"{record['app']} ({record['url']})"
+        )
+        if record["reused"]:
+            line += " reused"
+        if record["failure"] is not None:
+            line += f" FAILED: {record['failure']}"
+        terminalreporter.write_line(line)
@@ -0,0 +1,220 @@
+import base64
+import hashlib
+import json
+from io import BytesIO
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Sequence
+from typing import Union
+from urllib.parse import urlsplit
+
+import pytest
+from flask.testing import EnvironBuilder
+from werkzeug.datastructures import Headers
+from werkzeug.test import EnvironBuilder as BaseEnvironBuilder
+from werkzeug.wrappers import Request
+from werkzeug.wsgi import get_current_url
+
+#: Request headers taken into account by default to match recorded responses.
+DEFAULT_REPLAY_HEADERS = (
+    "Accept",
+    "Accept-Charset",
+    "Accept-Encoding",
+    "Accept-Language",
+    "Authorization",
+    "Content-Type",
+    "Cookie",
+)
+
+# Response headers which differ between two identical responses
+_VOLATILE_HEADERS = frozenset(["date"])
+
+
+def _stable_str(value: Any) -> str:
+    text = str(value)
+    # Default object representations change from one run to another
+    return type(value).__qualname__ if " at 0x" in text else text
+
+
+def config_fingerprint(config: Dict[str, Any]) -> str:
+    """Return a hash of the application ``config`` which is stable across
+    runs."""
+    data = json.dumps(config, sort_keys=True, default=_stable_str)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def _cookie_signature(header: str) -> str:
+    # The value and expiry date of a cookie may change on every response,
+    # e.g. Flask session cookies are signed with a timestamp
+    name = header.partition("=")[0].strip()
+    attributes = [attribute.strip() for attribute in header.split(";")[1:]]
+    return "; ".join(
+        [name]
+        + [
+            "Expires" if attribute.lower().startswith("expires=") else attribute
+            for attribute in attributes
+        ]
+    )
+
+
+def _comparable(recorded: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a recorded response without the values of the cookies it sets."""
+    return dict(
+        recorded,
+        headers=[
+            [name, _cookie_signature(value) if name.lower() == "set-cookie" else value]
+            for name, value in recorded["headers"]
+        ],
+        cookies=[
+            [server_name, path, [_cookie_signature(header) for header in headers]]
+            for server_name, path, headers in recorded.get("cookies", [])
+        ],
+    )
+
+
+def _cookie_origin(environ: Dict[str, Any]) -> List[str]:
+    url = urlsplit(get_current_url(environ))
+    return [url.hostname or "localhost", url.path]
+
+
+class ResponseCache:
+    """Store of recorded responses, kept in memory and in the pytest cache
+    directory, if available, to be replayed in later runs."""
+
+    def __init__(self, cache: Any = None):
+        self.cache = cache
+        self._responses: Dict[str, Any] = {}
+
+    def get(self, key: str) -> Union[Dict[str, Any], None]:
+        if key not in self._responses and self.cache is not None:
+            self._responses[key] = self.cache.get(f"pytest_flask/replay/{key}", None)
+        return self._responses[key] if key in self._responses else None
+
+    def set(self, key: str, recorded: Dict[str, Any]) -> None:
+        self._responses[key] = recorded
+        if self.cache is not None:
+            self.cache.set(f"pytest_flask/replay/{key}", recorded)
+
+
+class ReplayClient:
+    """Makes the ``open`` method of a Flask test client replay recorded
+    responses for identical requests instead of running the application.
+
+    :param client: The Flask test client.
+    :param cache: The store of recorded responses.
+    :param mode: ``on`` to replay recorded responses and record missing
+                 ones, ``verify`` to always run the application and fail if
+                 its response differs from the recorded one.
+    :param headers: The request headers which must match for a recorded
+                    response to be replayed.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        cache: ResponseCache,
+        mode: str = "on",
+        headers: Sequence[str] = DEFAULT_REPLAY_HEADERS,
+    ):
+        self.client = client
+        self.cache = cache
+        self.mode = mode
+        self.headers = [name.lower() for name in headers]
+        self.fingerprint = config_fingerprint(client.application.config)
+        #: Number of replayed and recorded responses.
+        self.hits = 0
+        self.misses = 0
+        self._open = client.open
+        client.open = self.open
+
+    def open(self, *args, buffered=False, follow_redirects=False, **kwargs):
+        if args and isinstance(args[0], (BaseEnvironBuilder, dict, Request)):
+            return self._open(
+                *args, buffered=buffered, follow_redirects=follow_redirects, **kwargs
+            )
+
+        builder = EnvironBuilder(self.client.application, *args, **kwargs)
+        try:
+            request = builder.get_request()
+        finally:
+            builder.close()
+        body = request.environ["wsgi.input"].read()
+        request.environ["wsgi.input"] = BytesIO(body)
+        # The key must see the cookies the client sends along
+        self.client._add_cookies_to_wsgi(request.environ)
+        key = self._key(request, body, follow_redirects)
+
+        recorded = self.cache.get(key)
+        if recorded is not None and self.mode == "on":
+            self.hits += 1
+            return self._replay(request, recorded)
+
+        self.misses += 1
+        response = self._open(
+            request, buffered=buffered, follow_redirects=follow_redirects
+        )
+        fresh = self._record(response)
+        if recorded is not None and _comparable(recorded) != _comparable(fresh):
+            pytest.fail(
+                "Response of {} {} differs from the recorded one:\n"
+                "recorded: {}\nfresh:    {}".format(
+                    request.method, request.full_path, recorded, fresh
+                )
+            )
+        self.cache.set(key, fresh)
+        return response
+
+    def _key(self, request: Request, body: bytes, follow_redirects: bool) -> str:
+        headers = sorted(
+            (name.lower(), value)
+            for name, value in request.headers.items()
+            if name.lower() in self.headers
+        )
+        data = json.dumps(
+            [
+                self.fingerprint,
+                request.method,
+                request.full_path,
+                hashlib.sha256(body).hexdigest(),
+                headers,
+                follow_redirects,
+            ]
+        )
+        return hashlib.sha256(data.encode()).hexdigest()
+
+    def _record(self, response: Any) -> Dict[str, Any]:
+        # Cookies set by the response and by the redirects it followed, with
+        # the host and path of their request, to update the client on replay
+        cookies = [
+            [*_cookie_origin(r.request.environ), r.headers.getlist("Set-Cookie")]
+            for r in [*response.history, response]
+            if "Set-Cookie" in r.headers
+        ]
+        return {
+            "status": response.status,
+            "headers": [
+                [name, value]
+                for name, value in response.headers.items()
+                if name.lower() not in _VOLATILE_HEADERS
+            ],
+            "body": base64.b64encode(response.get_data()).decode("ascii"),
+            "cookies": cookies,
+        }
+
+    def _replay(self, request: Request, recorded: Dict[str, Any]) -> Any:
+        for server_name, path, headers in recorded.get("cookies", []):
+            self.client._update_cookies_from_response(server_name, path, headers)
+        response = self.client.response_wrapper(
+            [base64.b64decode(recorded["body"])],
+            recorded["status"],
+            Headers([tuple(header) for header in recorded["headers"]]),
+            request=request,
+        )
+        response.json_module = self.client.application.json
+        return response
+
+    def __repr__(self):
+        return "<ReplayClient mode={} hits={} misses={}>".format(
+            self.mode, self.hits, self.misses
+        )
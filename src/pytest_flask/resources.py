@@ -0,0 +1,61 @@
+import os
+from typing import NamedTuple
+from typing import Union
+
+
+class ResourceUsage(NamedTuple):
+    """Resource usage of a process."""
+
+    #: User and system CPU time, in seconds.
+    cpu_time: float
+    #: Resident set size, in bytes.
+    rss: int
+    #: Number of open file descriptors.
+    fds: int
+    #: Number of threads.
+    threads: int
+
+    def since(self, earlier: "ResourceUsage") -> "ResourceUsage":
+        """Return the growth of each resource since ``earlier``."""
+        return ResourceUsage(
+            self.cpu_time - earlier.cpu_time,
+            self.rss - earlier.rss,
+            self.fds - earlier.fds,
+            self.threads - earlier.threads,
+        )
+
+
+def sample_process(pid: int) -> Union[ResourceUsage, None]:
+    """Read the resource usage of the process ``pid`` from ``/proc``.
+
+    :return: ``None`` if the process is gone or ``/proc`` isn't available
+             (i.e. not on Linux).
+    """
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            stat = f.read()
+        fds = len(os.listdir(f"/proc/{pid}/fd"))
+    except OSError:
+        return None
+
+    # The process name may contain spaces, fields after it are
+    # documented in proc(5) starting with field 3 (state).
+    fields = stat[stat.rindex(")") + 2 :].split()
+    utime, stime = int(fields[11]), int(fields[12])
+    threads = int(fields[17])
+    rss_pages = int(fields[21])
+    return ResourceUsage(
+        (utime + stime) / os.sysconf("SC_CLK_TCK"),
+        rss_pages * os.sysconf("SC_PAGE_SIZE"),
+        fds,
+        threads,
+    )
+
+
+def _format_usage(usage: ResourceUsage, sign: str = "") -> str:
+    return (
+        "cpu {0:{sign}.2f}s, rss {1:{sign}.1f} MiB, "
+        "{2:{sign}d} fds, {3:{sign}d} threads".format(
+            usage.cpu_time, usage.rss / 2**20, usage.fds, usage.threads, sign=sign
+        )
+    )
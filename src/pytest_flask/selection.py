@@ -0,0 +1,194 @@
+import ast
+import functools
+import hashlib
+import inspect
+import os
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Set
+from typing import Tuple
+from typing import Union
+
+import pytest
+
+#: Key of the views used by each test in the pytest cache.
+CACHE_KEY = "pytest_flask/views"
+
+_ViewLocation = Tuple[str, str]
+
+
+def _view_location(view: Any) -> Union[_ViewLocation, None]:
+    """Return the source file and the qualified name of a view function or
+    of the class of a class-based view."""
+    target = inspect.unwrap(getattr(view, "view_class", view))
+    try:
+        filename = inspect.getsourcefile(target)
+    except TypeError:
+        return None
+    if filename is None:
+        return None
+    return os.path.abspath(filename), target.__qualname__
+
+
+@functools.lru_cache(maxsize=None)
+def _parse(filename: str, mtime: int, size: int) -> Union[ast.Module, None]:
+    try:
+        with open(filename, "rb") as f:
+            return ast.parse(f.read(), filename)
+    except (OSError, SyntaxError, ValueError):
+        return None
+
+
+def _source_hash(filename: str, qualname: str) -> Union[str, None]:
+    """Return a hash of the syntax tree of the function or class
+    ``qualname`` defined in ``filename``, or of the whole module if
+    ``qualname`` is empty, so that formatting changes or code moving around
+    in the file don't change it.
+
+    :return: ``None`` if it can't be found.
+    """
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return None
+    tree = _parse(filename, stat.st_mtime_ns, stat.st_size)
+    node: Any = tree
+    for name in qualname.split(".") if qualname else []:
+        if name == "<locals>":
+            continue
+        node = next(
+            (
+                child
+                for child in ast.walk(node)
+                if isinstance(
+                    child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+                )
+                and child.name == name
+                and child is not node
+            ),
+            None,
+        )
+        if node is None:
+            return None
+    return hashlib.sha256(ast.dump(node).encode()).hexdigest()
+
+
+class ChangedViewsSelector:
+    """Plugin recording the views each test requests through the ``client``
+    and ``live_server`` fixtures, and deselecting tests whose module and
+    requested views didn't change since they last passed.
+
+    Tests which sent no request, or a request not handled by a view with a
+    known source, always run.
+
+    With pytest-xdist, workers send the views requested by their tests to
+    the controller, which stores them in the cache.
+
+    :param cache: The pytest cache.
+    """
+
+    def __init__(self, cache: Any):
+        self.cache = cache
+        self.tests: Dict[str, List[List[str]]] = cache.get(CACHE_KEY, {})
+        self._modules: Dict[str, str] = {}
+        self._observed: Dict[str, Set[_ViewLocation]] = {}
+        self._untracked: Set[str] = set()
+        self._failed: Set[str] = set()
+        # Entries of ``tests`` changed by this session, ``None`` if removed
+        self._changes: Dict[str, Union[List[List[str]], None]] = {}
+
+    def track(self, nodeid: str) -> None:
+        """Start recording the views requested by test ``nodeid``."""
+        self._observed.setdefault(nodeid, set())
+
+    def observe(self, nodeid: str, app: Any, endpoint: Union[str, None]) -> None:
+        """Record that test ``nodeid`` requested ``endpoint`` of ``app``."""
+        observed = self._observed.setdefault(nodeid, set())
+        view = app.view_functions.get(endpoint) if endpoint else None
+        location = _view_location(view) if view is not None else None
+        if location is None:
+            self._untracked.add(nodeid)
+        else:
+            observed.add(location)
+
+    def observe_path(self, nodeid: str, app: Any, method: str, path: str) -> None:
+        """Record that test ``nodeid`` requested ``path`` of ``app``."""
+        from werkzeug.exceptions import HTTPException
+
+        adapter = app.url_map.bind("localhost")
+        try:
+            endpoint, _ = adapter.match(path, method)
+        except HTTPException:
+            endpoint = None
+        self.observe(nodeid, app, endpoint)
+
+    def is_affected(self, nodeid: str) -> bool:
+        """Tell whether test ``nodeid`` should run: it is unknown, or its
+        module or one of the views it requested when it last passed
+        changed."""
+        if not self.tests.get(nodeid):
+            return True
+        return any(
+            _source_hash(filename, qualname) != digest
+            for filename, qualname, digest in self.tests[nodeid]
+        )
+
+    def pytest_collection_modifyitems(self, config, items) -> None:
+        selected = []
+        deselected = []
+        for item in items:
+            self._modules[item.nodeid] = str(item.path)
+            if self.is_affected(item.nodeid):
+                selected.append(item)
+            else:
+                deselected.append(item)
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = selected
+
+    def pytest_runtest_logreport(self, report) -> None:
+        if getattr(report, "node", None) is not None:
+            # Report of a pytest-xdist worker, which records the test itself
+            return
+        if report.failed:
+            self._failed.add(report.nodeid)
+        if report.when != "teardown":
+            return
+        nodeid = report.nodeid
+        observed = self._observed.pop(nodeid, None)
+        module = self._modules.get(nodeid)
+        module_digest = _source_hash(module, "") if module is not None else None
+        if (
+            nodeid in self._failed
+            or nodeid in self._untracked
+            or not observed
+            or module is None
+            or module_digest is None
+        ):
+            # Run again next time
+            self._changes[nodeid] = None
+            return
+        self._changes[nodeid] = [[module, "", module_digest]] + [
+            [filename, qualname, digest]
+            for filename, qualname in sorted(observed)
+            for digest in [_source_hash(filename, qualname)]
+            if digest is not None
+        ]
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error) -> None:
+        changes = getattr(node, "workeroutput", {}).get(CACHE_KEY, {})
+        self._changes.update(changes)
+
+    def pytest_sessionfinish(self, session) -> None:
+        config = session.config
+        if hasattr(config, "workeroutput"):
+            config.workeroutput[CACHE_KEY] = self._changes
+            return
+        for nodeid, sources in self._changes.items():
+            if sources is None:
+                self.tests.pop(nodeid, None)
+            else:
+                self.tests[nodeid] = sources
+        self.cache.set(CACHE_KEY, self.tests)
@@ -0,0 +1,124 @@
+import mmap
+import os
+from multiprocessing import shared_memory
+from typing import Any
+from typing import cast
+from typing import Dict
+from typing import Union
+
+
+def _attach_shared_memory(name: str, size: int) -> "SharedDataset":
+    # Live server processes share the resource tracker of the test process,
+    # which destroys the shared memory when the test process exits
+    return SharedDataset(shared_memory.SharedMemory(name), size, owner=False)
+
+
+def _attach_file(path: str) -> "SharedDataset":
+    return SharedDataset.from_file(path)
+
+
+class SharedDataset:
+    """A read-only dataset in shared memory or in a memory-mapped file.
+
+    Forked live server processes inherit the mapping, and other processes
+    (e.g. with the ``spawn`` start method) attach to it when the dataset is
+    pickled, instead of copying or loading the data again.
+    """
+
+    def __init__(
+        self,
+        source: Union[shared_memory.SharedMemory, mmap.mmap],
+        size: int,
+        owner: bool = False,
+        path: Union[str, None] = None,
+    ):
+        buffer: memoryview
+        if isinstance(source, shared_memory.SharedMemory):
+            buffer = cast(memoryview, source.buf)
+        else:
+            buffer = memoryview(source)
+        # Set before the source so that the view is released first when the
+        # dataset is garbage collected, and the source can then be closed
+        #: The content of the dataset.
+        self.buffer = buffer[:size].toreadonly()
+        self._source = source
+        self.size = size
+        self.path = path
+        self._owner = owner
+
+    @classmethod
+    def from_file(cls, path: str) -> "SharedDataset":
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if not size:
+                return cls(shared_memory.SharedMemory(create=True, size=1), 0, True)
+            source = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(source, size, path=path)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __reduce__(self):
+        if self.path is not None:
+            return _attach_file, (self.path,)
+        return _attach_shared_memory, (self._source.name, self.size)
+
+    def close(self) -> None:
+        """Release the mapping, and destroy the shared memory if it was
+        created by this process."""
+        try:
+            self.buffer.release()
+            self._source.close()
+        except BufferError:
+            # Views of the data are still alive, the mapping is released
+            # with the process
+            pass
+        if self._owner:
+            self._source.unlink()  # type: ignore[union-attr]
+
+    def __repr__(self):
+        return "<SharedDataset of %d bytes>" % self.size
+
+
+class SharedDatasets:
+    """Datasets shared read-only between the test process and the live
+    server processes, created once per session."""
+
+    def __init__(self):
+        self._datasets: Dict[str, SharedDataset] = {}
+
+    def add(self, name: str, data: Any) -> SharedDataset:
+        """Copy ``data``, a bytes-like object, into shared memory.
+
+        :return: The dataset already registered as ``name``, if any.
+        """
+        if name in self._datasets:
+            return self._datasets[name]
+        view = memoryview(data).cast("B")
+        shm = shared_memory.SharedMemory(create=True, size=max(len(view), 1))
+        cast(memoryview, shm.buf)[: len(view)] = view
+        dataset = SharedDataset(shm, len(view), owner=True)
+        self._datasets[name] = dataset
+        return dataset
+
+    def add_file(
+        self, name: str, path: Union[str, "os.PathLike[str]"]
+    ) -> SharedDataset:
+        """Map the file at ``path`` in memory, read-only.
+
+        :return: The dataset already registered as ``name``, if any.
+        """
+        if name not in self._datasets:
+            self._datasets[name] = SharedDataset.from_file(os.fspath(path))
+        return self._datasets[name]
+
+    def __getitem__(self, name: str) -> SharedDataset:
+        return self._datasets[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._datasets
+
+    def close(self) -> None:
+        for dataset in self._datasets.values():
+            dataset.close()
+        self._datasets = {}
@@ -0,0 +1,180 @@
+import io
+import mmap
+import os
+import tempfile
+from typing import Any
+from typing import BinaryIO
+from typing import cast
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Union
+
+#: Size (in bytes) above which spooled response bodies are written to disk.
+SPOOL_SIZE = 1024 * 1024
+
+#: Size (in bytes) of the chunks read from request and response bodies.
+CHUNK_SIZE = 64 * 1024
+
+
+class _IterableStream(io.RawIOBase):
+    """A read-only file object reading the chunks of an iterable of bytes."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._pending = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        while not self._pending:
+            try:
+                self._pending = bytes(next(self._chunks))
+            except StopIteration:
+                return 0
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+class SpooledBody:
+    """A response body spooled to a temporary file, in memory until it grows
+    larger than ``max_size``. Iterating over it yields its content in chunks,
+    from the beginning every time.
+
+    :param max_size: The size above which the body is written to disk.
+    """
+
+    def __init__(self, max_size: int = SPOOL_SIZE):
+        self.file = tempfile.SpooledTemporaryFile(max_size=max_size)
+        self.size = 0
+
+    def write(self, chunk: bytes) -> None:
+        self.file.write(chunk)
+        self.size += len(chunk)
+
+    def __iter__(self) -> Iterator[bytes]:
+        self.file.seek(0)
+        return iter(lambda: self.file.read(CHUNK_SIZE), b"")
+
+    def __len__(self) -> int:
+        return self.size
+
+    def read(self) -> bytes:
+        """Read the whole body in memory."""
+        self.file.seek(0)
+        return self.file.read()
+
+    def mmap(self) -> Union[mmap.mmap, bytes]:
+        """Map the body in memory, without reading it. Empty bodies can't be
+        mapped, and are returned as ``b""``."""
+        if not self.size:
+            return b""
+        self.file.rollover()
+        return mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self) -> None:
+        self.file.close()
+
+
+class StreamingClient:
+    """Send requests with bodies streamed from files or iterables through a
+    Flask test client, and spool response bodies to temporary files, so that
+    neither is held in memory as a whole.
+
+    :param client: A Flask test client.
+    :param spool_size: The size above which response bodies are written to
+        disk.
+    """
+
+    def __init__(self, client: Any, spool_size: int = SPOOL_SIZE):
+        self.client = client
+        self.spool_size = spool_size
+        self._bodies: List[SpooledBody] = []
+
+    def open(
+        self,
+        *args: Any,
+        body: Union[str, "os.PathLike[str]", BinaryIO, Iterable[bytes], None] = None,
+        content_length: Union[int, None] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """Send a request like :meth:`flask.testing.FlaskClient.open` and
+        spool its response.
+
+        :param body: The request body: the path of a file, a binary file
+            object or an iterable of bytes, read in chunks while the
+            application reads the request.
+        :param content_length: The length of the body, guessed for files.
+            Bodies of unknown length are sent as if with a chunked transfer
+            encoding, and are read until they are exhausted.
+
+        :return: The response, whose ``body`` attribute is the
+            :class:`SpooledBody` of its content. ``data`` and ``json`` read
+            the whole body in memory.
+        """
+        if body is None:
+            return self._spool(self.client.open(*args, buffered=False, **kwargs))
+
+        if isinstance(body, (str, os.PathLike)):
+            with open(body, "rb") as f:
+                return self.open(*args, body=f, content_length=content_length, **kwargs)
+
+        stream: BinaryIO
+        if hasattr(body, "read"):
+            stream = cast(BinaryIO, body)
+            if content_length is None:
+                try:
+                    content_length = os.fstat(stream.fileno()).st_size - stream.tell()
+                except (AttributeError, OSError, io.UnsupportedOperation):
+                    pass
+        else:
+            stream = cast(
+                BinaryIO, io.BufferedReader(_IterableStream(body), CHUNK_SIZE)
+            )
+
+        # Werkzeug needs a seekable input stream to measure it, so the stream
+        # is only swapped in the environ once it is built
+        environ_overrides = dict(kwargs.pop("environ_overrides", None) or {})
+        environ_overrides["wsgi.input"] = stream
+        if content_length is None:
+            environ_overrides["wsgi.input_terminated"] = True
+            environ_overrides["HTTP_TRANSFER_ENCODING"] = "chunked"
+        else:
+            environ_overrides["CONTENT_LENGTH"] = str(content_length)
+        response = self.client.open(
+            *args, environ_overrides=environ_overrides, buffered=False, **kwargs
+        )
+        return self._spool(response)
+
+    def _spool(self, response: Any) -> Any:
+        body = SpooledBody(self.spool_size)
+        self._bodies.append(body)
+        try:
+            for chunk in response.iter_encoded():
+                body.write(chunk)
+        finally:
+            response.close()
+        response.response = body
+        response.body = body
+        return response
+
+    def get(self, *args: Any, **kwargs: Any) -> Any:
+        return self.open(*args, method="GET", **kwargs)
+
+    def post(self, *args: Any, **kwargs: Any) -> Any:
+        return self.open(*args, method="POST", **kwargs)
+
+    def put(self, *args: Any, **kwargs: Any) -> Any:
+        return self.open(*args, method="PUT", **kwargs)
+
+    def patch(self, *args: Any, **kwargs: Any) -> Any:
+        return self.open(*args, method="PATCH", **kwargs)
+
+    def close(self) -> None:
+        """Delete the spooled response bodies."""
+        for body in self._bodies:
+            body.close()
+        self._bodies = []
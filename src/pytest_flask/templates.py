@@ -0,0 +1,46 @@
+import hashlib
+import os
+from typing import Any
+from typing import List
+
+from jinja2 import FileSystemBytecodeCache
+from jinja2 import TemplateError
+
+
+def _cache_directory(root: str, app: Any) -> str:
+    # Bytecode is only keyed by template name and source, so applications
+    # compiling templates with other extensions get their own directory
+    env = app.jinja_env
+    key = "\0".join([app.import_name, *sorted(env.extensions)])
+    return os.path.join(root, hashlib.sha256(key.encode()).hexdigest()[:16])
+
+
+def compile_templates(app: Any, cache_dir: str) -> List[str]:
+    """Compile every template of ``app`` and of its blueprints into the
+    template cache of its Jinja environment, so that the first render in each
+    test, or in each live server process forked afterwards, doesn't compile
+    it again.
+
+    Unless the application set up its own, the bytecode is also stored in a
+    :class:`jinja2.FileSystemBytecodeCache` under ``cache_dir``, shared with
+    later sessions and other processes, and only compiled again when the
+    source of the template changes.
+
+    Templates which fail to compile are left alone, so that the error is
+    raised by the test rendering them.
+
+    :return: The names of the templates which failed to compile.
+    """
+    env = app.jinja_env
+    if env.bytecode_cache is None:
+        directory = _cache_directory(cache_dir, app)
+        os.makedirs(directory, exist_ok=True)
+        env.bytecode_cache = FileSystemBytecodeCache(directory)
+
+    failed = []
+    for name in env.list_templates():
+        try:
+            env.get_template(name)
+        except (TemplateError, UnicodeDecodeError):
+            failed.append(name)
+    return failed
@@ -0,0 +1,139 @@
+import tracemalloc
+from typing import List
+
+import pytest
+from flask import Flask
+
+
+_leaked: List[bytearray] = []
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+
+    @app.route("/bloat")
+    def bloat():
+        chunks = [bytes(1024) for _ in range(1024)]
+        return str(len(chunks))
+
+    @app.route("/leak")
+    def leak():
+        _leaked.append(bytearray(256 * 1024))
+        return "ok"
+
+    return app
+
+
+class TestAllocationTracker:
+    def test_peak(self, client, flask_allocations):
+        assert client.get("/bloat").data == b"1024"
+        (record,) = flask_allocations.records
+        assert record.method == "GET"
+        assert record.path == "/bloat"
+        assert record.endpoint == "bloat"
+        assert record.peak > 1024 * 1024
+        assert record.net < 256 * 1024
+        flask_allocations.assert_max(net=256 * 1024)
+
+    def test_net(self, client, flask_allocations):
+        client.get("/leak")
+        client.get("/bloat")
+        (record,) = flask_allocations.by_endpoint()["leak"]
+        assert record.net >= 256 * 1024
+        site, size = record.top[0]
+        assert site.startswith(__file__)
+        assert size >= 256 * 1024
+        flask_allocations.assert_max(net=512 * 1024)
+        with pytest.raises(pytest.fail.Exception, match="Net allocation above"):
+            flask_allocations.assert_max(net=128 * 1024, endpoint="leak")
+        flask_allocations.assert_max(net=128 * 1024, endpoint="bloat")
+
+    def test_already_tracing(self, client, flask_allocations):
+        tracemalloc.start()
+        try:
+            client.get("/leak")
+            assert tracemalloc.is_tracing()
+        finally:
+            tracemalloc.stop()
+        (record,) = flask_allocations.records
+        assert record.net >= 256 * 1024
+        assert record.top[0][0].startswith(__file__)
+
+    def test_not_traced_by_default(self, client):
+        assert client.open.__self__ is client
+
+
+def test_assert_max(appdir):
+    appdir.create_test_module(
+        """
+        def test_bloat(app, client, flask_allocations):
+            @app.route('/bloat')
+            def bloat():
+                return str(len([bytes(1024) for _ in range(1024)]))
+
+            client.get('/bloat')
+            flask_allocations.assert_max(peak=64 * 1024)
+        """
+    )
+    result = appdir.runpytest()
+    result.assert_outcomes(failed=1)
+    result.stdout.fnmatch_lines(
+        [
+            "*Peak allocation above 65536 bytes:",
+            "*GET /bloat (bloat): peak * bytes, net * bytes",
+        ]
+    )
+
+
+def test_summary(appdir):
+    appdir.create_test_module(
+        """
+        import pytest
+
+        @pytest.fixture(autouse=True)
+        def routes(app):
+            if 'index' not in app.view_functions:
+                app.add_url_rule('/', 'index', lambda: 'x' * 100000)
+
+        def test_first(client):
+            client.get('/')
+
+        def test_second(client):
+            client.get('/')
+            client.get('/missing')
+        """
+    )
+    result = appdir.runpytest("--flask-allocations")
+    result.assert_outcomes(passed=2)
+    result.stdout.fnmatch_lines(
+        [
+            "*= flask allocations per endpoint =*",
+            "*max peak*max net*requests*endpoint (test of max peak)",
+            "* 2  index (tests/test_app.py::test_*)",
+            "* 1  None (tests/test_app.py::test_second)",
+        ]
+    )
+
+
+def test_summary_xdist(appdir):
+    pytest.importorskip("xdist")
+    appdir.create_test_module(
+        """
+        def test_first(app, client):
+            app.add_url_rule('/', 'index', lambda: 'x' * 100000)
+            client.get('/')
+
+        def test_second(app, client):
+            app.add_url_rule('/', 'index', lambda: 'x' * 100000)
+            client.get('/')
+        """
+    )
+    result = appdir.runpytest_subprocess("-n", "2", "--flask-allocations")
+    result.assert_outcomes(passed=2)
+    result.stdout.fnmatch_lines(
+        [
+            "*= flask allocations per endpoint =*",
+            "* 2  index (tests/test_app.py::test_*)",
+        ]
+    )
@@ -0,0 +1,128 @@
+import json
+import os
+
+import pytest
+
+from pytest_flask.benchmark import BenchmarkResult
+
+
+CONFTEST = """
+    import os
+    import time
+
+    import pytest
+    from flask import Flask
+
+    @pytest.fixture(scope='session')
+    def app():
+        app = Flask(__name__)
+
+        @app.route('/')
+        def index():
+            time.sleep(float(os.environ.get('BENCH_DELAY', 0)))
+            return 'ok'
+
+        return app
+"""
+
+TEST_INDEX = """
+    import pytest
+
+    pytestmark = pytest.mark.flask_benchmark(max_time=0.05, min_time=0.0001)
+
+    def test_index(flask_benchmark):
+        assert flask_benchmark('/') == 200
+        (result,) = flask_benchmark.results
+        assert result.name == 'test_index'
+        assert result.rounds >= 5
+"""
+
+
+def test_result_statistics():
+    result = BenchmarkResult("index", [0.002, 0.001, 0.003], 10, baseline=0.0016)
+    assert result.min == 0.001
+    assert result.max == 0.003
+    assert result.median == 0.002
+    assert result.mean == pytest.approx(0.002)
+    assert result.ops == pytest.approx(500)
+    assert result.change == pytest.approx(0.25)
+    assert result.as_dict()["baseline"] == 0.0016
+
+
+def test_summary(appdir):
+    appdir.create_test_module(CONFTEST, filename="conftest.py")
+    appdir.create_test_module(TEST_INDEX)
+    result = appdir.runpytest()
+    result.assert_outcomes(passed=1)
+    result.stdout.fnmatch_lines(
+        ["*= flask benchmarks =*", "*median*mean*stddev*rounds*baseline*name*"]
+    )
+    result.stdout.fnmatch_lines(["*tests/test_app.py::test_index"])
+
+
+def test_baseline(appdir, monkeypatch):
+    appdir.create_test_module(CONFTEST, filename="conftest.py")
+    appdir.create_test_module(TEST_INDEX)
+    monkeypatch.setenv("BENCH_DELAY", "0.001")
+    appdir.runpytest("--flask-benchmark-save").assert_outcomes(passed=1)
+
+    appdir.runpytest().assert_outcomes(passed=1)
+
+    monkeypatch.setenv("BENCH_DELAY", "0.005")
+    result = appdir.runpytest("--flask-benchmark-tolerance=0.5")
+    result.assert_outcomes(failed=1)
+    result.stdout.fnmatch_lines(
+        ["*Benchmark 'test_index' is *% slower than its baseline*tolerance 50%*"]
+    )
+
+
+def test_json(appdir):
+    appdir.create_test_module(CONFTEST, filename="conftest.py")
+    appdir.create_test_module(TEST_INDEX)
+    appdir.create_test_module(
+        """
+        import pytest
+
+        pytestmark = pytest.mark.flask_benchmark(max_time=0.05, min_time=0.0001)
+
+        def test_named(flask_benchmark):
+            flask_benchmark('/', name='first')
+            flask_benchmark('/', name='second')
+            with pytest.raises(ValueError):
+                flask_benchmark('/', name='first')
+        """,
+        filename="test_named.py",
+    )
+    result = appdir.runpytest("--flask-benchmark-json=bench.json")
+    result.assert_outcomes(passed=2)
+
+    with open(os.path.join(str(appdir.tmpdir), "bench.json")) as f:
+        data = json.load(f)
+    names = [(b["nodeid"], b["name"]) for b in data["benchmarks"]]
+    assert sorted(names) == [
+        ("tests/test_app.py::test_index", "test_index"),
+        ("tests/test_named.py::test_named", "first"),
+        ("tests/test_named.py::test_named", "second"),
+    ]
+    assert data["benchmarks"][0]["median"] > 0
+    assert data["benchmarks"][0]["baseline"] is None
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_live_server(appdir):
+    appdir.create_test_module(CONFTEST, filename="conftest.py")
+    appdir.create_test_module(TEST_INDEX)
+    appdir.create_test_module(
+        """
+        import pytest
+
+        @pytest.mark.flask_benchmark(max_time=0.05, min_time=0.0001)
+        def test_live(live_server, flask_benchmark):
+            response = flask_benchmark('/')
+            assert response == 200
+            assert response.data == b'ok'
+        """,
+        filename="test_live.py",
+    )
+    result = appdir.runpytest("tests/test_live.py")
+    result.assert_outcomes(passed=1)
@@ -0,0 +1,127 @@
+import os
+import time
+
+import pytest
+from flask import Flask
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    last_request = {}
+
+    @app.route("/limited")
+    def limited():
+        now = time.monotonic()
+        if now - last_request.get("limited", -60) < 60:
+            return "slow down", 429
+        last_request["limited"] = now
+        return "ok"
+
+    return app
+
+
+class TestVirtualClock:
+    def test_advance(self, virtual_clock):
+        start = time.time()
+        virtual_clock.advance(3600)
+        assert time.time() - start >= 3600
+        assert virtual_clock.offset == 3600
+
+    def test_sleep_is_instant(self, virtual_clock):
+        real_start = time.perf_counter()
+        start = time.monotonic()
+        time.sleep(120)
+        assert time.monotonic() - start >= 120
+        assert time.perf_counter() - real_start < 1
+
+    def test_cannot_go_backwards(self, virtual_clock):
+        with pytest.raises(ValueError):
+            virtual_clock.advance(-1)
+
+    def test_client(self, client, virtual_clock):
+        assert client.get("/limited").status_code == 200
+        assert client.get("/limited").status_code == 429
+        virtual_clock.advance(60)
+        assert client.get("/limited").status_code == 200
+
+    def test_real_time_after_test(self):
+        from pytest_flask.clock import _real_time
+
+        assert abs(time.time() - _real_time()) < 1
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_live_server(appdir):
+    appdir.create_test_module(
+        """
+        import time
+
+        import pytest
+        from flask import Flask, jsonify
+
+        @pytest.fixture(scope='session')
+        def app():
+            app = Flask(__name__)
+            last_request = {}
+
+            @app.route('/limited')
+            def limited():
+                now = time.monotonic()
+                if now - last_request.get('limited', -60) < 60:
+                    return 'slow down', 429
+                last_request['limited'] = now
+                return 'ok'
+
+            @app.route('/sleep/<int:seconds>')
+            def sleep(seconds):
+                time.sleep(seconds)
+                return 'ok'
+
+            return app
+    """,
+        filename="conftest.py",
+    )
+    appdir.create_test_module(
+        """
+        import time
+        from urllib.error import HTTPError
+        from urllib.request import urlopen
+
+        import pytest
+
+        def test_rate_limit(live_server, virtual_clock):
+            assert urlopen(live_server.url('/limited')).status == 200
+            with pytest.raises(HTTPError, match='429'):
+                urlopen(live_server.url('/limited'))
+            virtual_clock.advance(60)
+            assert urlopen(live_server.url('/limited')).status == 200
+
+        def test_server_sleep(live_server, virtual_clock):
+            start = time.time()
+            assert urlopen(live_server.url('/sleep/600'), timeout=5).status == 200
+            assert time.time() - start >= 600
+    """
+    )
+    result = appdir.runpytest()
+    result.assert_outcomes(passed=2)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_live_server_without_clock(appdir):
+    appdir.create_test_module(
+        """
+        def test_without_clock(live_server):
+            print('clock:', live_server.clock is not None)
+
+        def test_with_clock(live_server, virtual_clock):
+            pass
+    """
+    )
+    result = appdir.runpytest("-s", "-k", "without")
+    result.stdout.fnmatch_lines(["*clock: False*"])
+    result.assert_outcomes(passed=1, deselected=1)
+
+    result = appdir.runpytest("-s")
+    result.stdout.fnmatch_lines(["*clock: True*"])
+    result.assert_outcomes(passed=2)
@@ -0,0 +1,114 @@
+import os
+import threading
+import time
+
+import pytest
+from flask import Flask
+from flask import jsonify
+from flask import request
+
+from pytest_flask.concurrency import ConcurrentClient
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.counter = 0
+    app.lock = threading.Lock()
+
+    @app.route("/increment", methods=["POST"])
+    def increment():
+        # A racy read-modify-write
+        value = app.counter
+        time.sleep(0.01)
+        app.counter = value + 1
+        return jsonify(value=app.counter)
+
+    @app.route("/safe-increment", methods=["POST"])
+    def safe_increment():
+        with app.lock:
+            app.counter += 1
+            return jsonify(value=app.counter)
+
+    @app.route("/echo")
+    def echo():
+        return jsonify(args=request.args, thread=threading.get_ident())
+
+    return app
+
+
+class TestConcurrentClient:
+    def test_lost_updates(self, app, concurrent_client):
+        results = concurrent_client.run(8, "/increment", method="POST")
+        assert [result.response.status_code for result in results] == [200] * 8
+        assert app.counter < 8
+
+    def test_safe_updates(self, app, concurrent_client):
+        results = concurrent_client.run(8, "/safe-increment", method="POST")
+        values = sorted(result.response.json["value"] for result in results)
+        assert values == list(range(1, 9))
+
+    def test_ordered_results(self, concurrent_client):
+        results = concurrent_client.map(
+            ["/echo?i=0", {"path": "/echo", "query_string": {"i": "1"}}]
+        )
+        assert [r.response.json["args"] for r in results] == [{"i": "0"}, {"i": "1"}]
+        assert results[0].response.json["thread"] != results[1].response.json["thread"]
+
+    def test_released_together(self, concurrent_client):
+        results = concurrent_client.run(4, "/increment", method="POST")
+        assert max(result.started for result in results) < 0.1
+        assert all(result.duration >= 0.01 for result in results)
+
+    def test_errors_are_raised(self, concurrent_client):
+        with pytest.raises(TypeError):
+            concurrent_client.run(2, "/echo", unknown=True)
+
+    def test_barrier_timeout(self, app, monkeypatch):
+        concurrent_client = ConcurrentClient(app, timeout=0.1)
+        prepare = concurrent_client._prepare
+
+        def slow_prepare(builder):
+            if builder.path == "/slow":
+                time.sleep(0.5)
+            return prepare(builder)
+
+        monkeypatch.setattr(concurrent_client, "_prepare", slow_prepare)
+        with pytest.raises(TimeoutError, match="2 of 2 requests weren't sent"):
+            concurrent_client.map(["/echo", "/slow"])
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_live_server(appdir):
+    appdir.create_test_module(
+        """
+        import pytest
+        from flask import Flask, request
+
+        @pytest.fixture(scope='session')
+        def app():
+            app = Flask(__name__)
+
+            @app.route('/pid', methods=['POST'])
+            def pid():
+                import os
+                return {'pid': os.getpid(), 'body': request.get_json()}
+
+            return app
+    """,
+        filename="conftest.py",
+    )
+    appdir.create_test_module(
+        """
+        import os
+
+        def test_live(live_server, concurrent_client):
+            results = concurrent_client.run(4, '/pid', method='POST', json=[1])
+            assert all(r.response == 200 for r in results)
+            pids = {r.response.json['pid'] for r in results}
+            assert pids == {live_server.pid}
+            assert results[0].response.json['body'] == [1]
+    """
+    )
+    result = appdir.runpytest()
+    result.assert_outcomes(passed=1)
@@ -0,0 +1,77 @@
+import pytest
+
+
+CONFTEST = """
+    import time
+
+    import pytest
+
+    from flask import Flask
+
+    @pytest.fixture
+    def app():
+        time.sleep(0.05)
+        return Flask(__name__)
+"""
+
+TEST_MODULE = """
+    def test_client(client):
+        pass
+
+    def test_without_app():
+        pass
+"""
+
+
+class TestFlaskDurations:
+    def test_slowest_setups(self, appdir):
+        appdir.create_test_module(CONFTEST, filename="conftest.py")
+        appdir.create_test_module(TEST_MODULE)
+        result = appdir.runpytest("--flask-durations=1")
+        result.stdout.fnmatch_lines(
+            [
+                "*= slowest 1 flask fixture setups =*",
+                "0.0?s app * tests/test_app.py::test_client",
+                "total per fixture:",
+                "0.0?s app * (1 setups, max 0.0?s)",
+            ]
+        )
+        # The app setup is not counted in fixtures requesting it
+        result.stdout.no_fnmatch_line("0.0[5-9]s client *")
+
+    def test_hidden_durations(self, appdir):
+        appdir.create_test_module(CONFTEST, filename="conftest.py")
+        appdir.create_test_module(TEST_MODULE)
+        result = appdir.runpytest("--flask-durations=0")
+        result.stdout.fnmatch_lines(
+            ["*= slowest flask fixture setups =*", "*durations < 0.005s hidden*"]
+        )
+        result = appdir.runpytest("--flask-durations=0", "-vv")
+        result.stdout.fnmatch_lines(["0.00s _configure_application *"])
+
+    def test_user_property(self, appdir):
+        appdir.create_test_module(CONFTEST, filename="conftest.py")
+        appdir.create_test_module(TEST_MODULE)
+        result = appdir.runpytest("--flask-durations=0", "--junitxml=out.xml")
+        result.assert_outcomes(passed=2)
+        xml = appdir.tmpdir.join("out.xml").read()
+        assert 'name="flask_durations"' in xml
+
+    def test_xdist(self, appdir):
+        pytest.importorskip("xdist")
+        appdir.create_test_module(CONFTEST, filename="conftest.py")
+        appdir.create_test_module(TEST_MODULE)
+        result = appdir.runpytest_subprocess("-n", "2", "--flask-durations=1")
+        result.assert_outcomes(passed=2)
+        result.stdout.fnmatch_lines(
+            [
+                "*= slowest 1 flask fixture setups =*",
+                "0.0?s app * tests/test_app.py::test_client",
+            ]
+        )
+
+    def test_disabled_by_default(self, appdir):
+        appdir.create_test_module(CONFTEST, filename="conftest.py")
+        appdir.create_test_module(TEST_MODULE)
+        result = appdir.runpytest()
+        result.stdout.no_fnmatch_line("*flask fixture setups*")
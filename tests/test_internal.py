@@ -1,5 +1,6 @@
 import pytest
 
+from pytest_flask._internal import _adaptive_wait
 from pytest_flask._internal import deprecated
 
 
@@ -13,3 +14,10 @@ class TestInternal:
             deprecated_fun()
         assert len(record) == 1
         assert record[0].message.args[0] == "testing decorator"
+
+    def test_adaptive_wait(self):
+        assert _adaptive_wait([0.5] * 4, 30) == 30
+        assert _adaptive_wait([0.1] * 10, 30) == 1.0
+        assert _adaptive_wait([0.5] * 19 + [2.0], 30) == 1.5
+        assert _adaptive_wait([0.5] * 18 + [2.0] * 2, 30) == 6.0
+        assert _adaptive_wait([20.0] * 5, 30) == 30
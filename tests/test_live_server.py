@@ -1,8 +1,14 @@
+import json
 import os
+import pstats
+import signal
+import time
 
 import pytest
 from flask import url_for
 
+from pytest_flask.live_server import _pid_exists
+
 
 pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
 
@@ -223,3 +229,800 @@ class TestLiveServer:
         result = appdir.runpytest("-v", "--live-server-wait=0.00000001")
         result.stdout.fnmatch_lines(["**ERROR**"])
         assert result.ret == 1
+
+    def test_capture_access_log(self, appdir):
+        appdir.create_test_module(
+            """
+            import pytest
+            from urllib.error import HTTPError
+            from urllib.request import urlopen
+
+            def test_a(live_server):
+                urlopen(live_server.url('/ping')).read()
+                with pytest.raises(HTTPError):
+                    urlopen(live_server.url('/ping/missing'))
+                log = live_server.access_log
+                assert [(r.method, r.path, r.status) for r in log] == [
+                    ('GET', '/ping', 200),
+                    ('GET', '/ping/missing', 404),
+                ]
+                assert all(r.duration >= 0 for r in log)
+
+            def test_b(live_server):
+                assert live_server.access_log == []
+        """
+        )
+        appdir.create_test_module(
+            """
+            import pytest
+
+            from flask import Flask, jsonify
+
+            @pytest.fixture(scope='session')
+            def app():
+                app = Flask(__name__)
+
+                @app.route('/ping')
+                def ping():
+                    return jsonify(ping='pong')
+
+                return app
+        """,
+            filename="conftest.py",
+        )
+        result = appdir.runpytest("-v", "--live-server-access-log=capture")
+        result.stdout.fnmatch_lines(["*2 passed*"])
+        assert result.ret == 0
+
+    def test_capture_access_log_many_requests(self, appdir):
+        appdir.create_test_module(
+            """
+            import http.client
+
+            def test_a(live_server):
+                conn = http.client.HTTPConnection(
+                    live_server.host, live_server.port, timeout=5
+                )
+                for _ in range(6000):
+                    conn.request('GET', '/')
+                    conn.getresponse().read()
+                conn.close()
+                assert len(live_server.access_log) == 6000
+        """
+        )
+        result = appdir.runpytest(
+            "--live-server-access-log=capture", "--live-server-backend=threadpool"
+        )
+        result.assert_outcomes(passed=1)
+
+    @pytest.mark.parametrize("access_log", ["stderr", "off"])
+    def test_access_log_not_captured(self, appdir, access_log):
+        appdir.create_test_module(
+            """
+            import pytest
+
+            def test_a(live_server):
+                assert live_server.access_log == []
+        """
+        )
+        result = appdir.runpytest("-v", "--live-server-access-log", access_log)
+        result.stdout.fnmatch_lines(["*1 passed*"])
+        assert result.ret == 0
+
+    def test_profile_live_server(self, appdir):
+        appdir.create_test_module(
+            """
+            import pytest
+            from urllib.request import urlopen
+
+            def test_a(live_server):
+                urlopen(live_server.url('/')).read()
+        """
+        )
+        appdir.create_test_module(
+            """
+            import pytest
+
+            from flask import Flask
+
+            @pytest.fixture(scope='session')
+            def app():
+                app = Flask(__name__)
+
+                @app.route('/')
+                def index():
+                    return 'OK'
+
+                return app
+        """,
+            filename="conftest.py",
+        )
+        result = appdir.runpytest("-v", "--live-server-profile=prof")
+        result.stdout.fnmatch_lines(["*1 passed*"])
+        assert result.ret == 0
+
+        stats = pstats.Stats(str(appdir.tmpdir.join("prof", "index.prof")))
+        (index,) = [f for f in stats.stats if f[2] == "index"]
+        assert stats.stats[index][1] == 1
+
+        # Stats of previous sessions are replaced, other files are left alone
+        appdir.tmpdir.join("prof", "other.prof").write("")
+        appdir.runpytest("--live-server-profile=prof").assert_outcomes(passed=1)
+        assert appdir.tmpdir.join("prof", "other.prof").exists()
+        stats = pstats.Stats(str(appdir.tmpdir.join("prof", "index.prof")))
+        assert stats.stats[index][1] == 1
+
+    def test_profile_live_server_xdist(self, appdir):
+        pytest.importorskip("xdist")
+        appdir.create_test_module(
+            """
+            import pytest
+            from urllib.request import urlopen
+
+            def index():
+                return 'OK'
+
+            @pytest.fixture(scope='session')
+            def app(app):
+                app.add_url_rule('/', 'index', index)
+                return app
+
+            @pytest.mark.parametrize('i', range(4))
+            def test_a(live_server, i):
+                urlopen(live_server.url('/')).read()
+        """
+        )
+        result = appdir.runpytest_subprocess(
+            "-n",
+            "2",
+            "-o",
+            "live_server_scope=function",
+            "--live-server-profile=prof",
+        )
+        result.assert_outcomes(passed=4)
+        assert appdir.tmpdir.join("prof").listdir() == [
+            appdir.tmpdir.join("prof", "index.prof")
+        ]
+        stats = pstats.Stats(str(appdir.tmpdir.join("prof", "index.prof")))
+        (index,) = [f for f in stats.stats if f[2] == "index"]
+        assert stats.stats[index][1] == 4
+
+
+class TestLiveServers:
+    CONFTEST = """
+        import pytest
+
+        from flask import Flask
+
+        def create_app(name):
+            app = Flask(name)
+
+            @app.route('/')
+            def index():
+                return name
+
+            return app
+
+        @pytest.fixture(scope='session')
+        def apps():
+            return {name: create_app(name) for name in ('users', 'orders')}
+    """
+
+    def test_start_live_servers(self, appdir):
+        appdir.create_test_module(self.CONFTEST, filename="conftest.py")
+        appdir.create_test_module(
+            """
+            from urllib.request import urlopen
+
+            def test_a(live_servers):
+                users, orders = live_servers['users'], live_servers['orders']
+                assert users.port != orders.port
+                assert users.app.config['SERVER_NAME'] == \\
+                    'localhost.localdomain:%d' % users.port
+                assert urlopen(users.url('/')).read() == b'users'
+                assert urlopen(orders.url('/')).read() == b'orders'
+        """
+        )
+        result = appdir.runpytest("-v")
+        result.stdout.fnmatch_lines(["*1 passed*"])
+        assert result.ret == 0
+
+    def test_live_servers_fixed_port(self, appdir):
+        appdir.create_test_module(self.CONFTEST, filename="conftest.py")
+        appdir.create_test_module(
+            """
+            def test_a(live_servers):
+                assert live_servers['users'].port == 5010
+                assert live_servers['orders'].port == 5011
+        """
+        )
+        result = appdir.runpytest(
+            "-v", "--no-start-live-server", "--live-server-port=5010"
+        )
+        result.stdout.fnmatch_lines(["*1 passed*"])
+        assert result.ret == 0
+
+    def test_stop_live_servers(self, appdir):
+        appdir.create_test_module(self.CONFTEST, filename="conftest.py")
+        appdir.create_test_module(
+            """
+            from pytest_flask.live_server import stop_live_servers
+
+            def test_a(live_servers):
+                stop_live_servers(list(live_servers.values()))
+                for server in live_servers.values():
+                    server._process.join(5)
+                    assert not server._process.is_alive()
+        """
+        )
+        result = appdir.runpytest("-v")
+        result.stdout.fnmatch_lines(["*1 passed*"])
+        assert result.ret == 0
+
+
+class TestLiveServerBackend:
+    @pytest.mark.parametrize("access_log", ["stderr", "capture"])
+    def test_threadpool_backend(self, appdir, access_log):
+        appdir.create_test_module(
+            """
+            import http.client
+
+            def test_keep_alive(live_server):
+                assert live_server.backend == 'threadpool'
+                conn = http.client.HTTPConnection(live_server.host, live_server.port)
+                for _ in range(3):
+                    conn.request('GET', '/missing')
+                    response = conn.getresponse()
+                    response.read()
+                    assert response.status == 404
+                    assert response.version == 11
+                    assert not response.will_close
+                conn.close()
+        """
+        )
+        result = appdir.runpytest(
+            "-v",
+            "--live-server-backend=threadpool",
+            "--live-server-access-log",
+            access_log,
+        )
+        result.stdout.fnmatch_lines(["*1 passed*"])
+        assert result.ret == 0
+
+    def test_threadpool_backend_http10(self, appdir):
+        appdir.create_test_module(
+            """
+            import socket
+
+            import pytest
+            from flask import stream_with_context
+
+            @pytest.fixture(scope='session')
+            def app(app):
+                @app.route('/stream')
+                def stream():
+                    return stream_with_context(iter(['a', 'b']))
+
+                return app
+
+            def test_http10(live_server):
+                conn = socket.create_connection((live_server.host, live_server.port))
+                conn.sendall(
+                    b'GET /stream HTTP/1.0\\r\\nConnection: keep-alive\\r\\n\\r\\n'
+                )
+                conn.settimeout(5)
+                data = b''
+                while True:
+                    chunk = conn.recv(4096)
+                    if not chunk:
+                        break
+                    data += chunk
+                conn.close()
+                head, _, body = data.partition(b'\\r\\n\\r\\n')
+                assert b'Transfer-Encoding' not in head
+                assert b'Connection: close' in head
+                assert body == b'ab'
+        """
+        )
+        result = appdir.runpytest("-v", "--live-server-backend=threadpool")
+        result.stdout.fnmatch_lines(["*1 passed*"])
+        assert result.ret == 0
+
+    def test_threadpool_backend_idle_connections(self, appdir):
+        appdir.create_test_module(
+            """
+            import http.client
+            import time
+
+            def get(conn):
+                conn.request('GET', '/missing')
+                response = conn.getresponse()
+                response.read()
+                return response
+
+            def test_idle_connections(live_server):
+                idle = []
+                for _ in range(40):
+                    conn = http.client.HTTPConnection(
+                        live_server.host, live_server.port
+                    )
+                    assert not get(conn).will_close
+                    idle.append(conn)
+
+                start = time.monotonic()
+                conn = http.client.HTTPConnection(
+                    live_server.host, live_server.port, timeout=2
+                )
+                assert get(conn).status == 404
+                assert time.monotonic() - start < 1
+                # The idle connections are still alive
+                assert get(idle[0]).status == 404
+                for conn in idle:
+                    conn.close()
+        """
+        )
+        result = appdir.runpytest("-v", "--live-server-backend=threadpool")
+        result.stdout.fnmatch_lines(["*1 passed*"])
+        assert result.ret == 0
+
+    def test_custom_backend(self, appdir):
+        appdir.makepyfile(
+            backend="""
+            from werkzeug.serving import make_server
+
+            def serve(app, host, port, quiet=False):
+                def tagged_app(environ, start_response):
+                    def tagged_start_response(status, headers, exc_info=None):
+                        headers = headers + [('X-Backend', 'custom')]
+                        return start_response(status, headers, exc_info)
+
+                    return app(environ, tagged_start_response)
+
+                make_server(host, port, tagged_app).serve_forever()
+        """
+        )
+        appdir.syspathinsert()
+        appdir.create_test_module(
+            """
+            from urllib.error import HTTPError
+            from urllib.request import urlopen
+
+            import pytest
+
+            def test_a(live_server):
+                with pytest.raises(HTTPError) as excinfo:
+                    urlopen(live_server.url('/missing'))
+                assert excinfo.value.headers['X-Backend'] == 'custom'
+        """
+        )
+        result = appdir.runpytest(
+            "-v", "-p", "no:cacheprovider", "--live-server-backend=backend:serve"
+        )
+        result.stdout.fnmatch_lines(["*1 passed*"])
+        assert result.ret == 0
+
+    def test_unknown_backend(self, appdir):
+        appdir.create_test_module(
+            """
+            def test_a(live_server):
+                pass
+        """
+        )
+        result = appdir.runpytest("-v", "--live-server-backend=unknown")
+        result.stdout.fnmatch_lines(["*unknown live server backend 'unknown'*"])
+        assert result.ret == 1
+
+
+class TestLiveServerReadiness:
+    CONFTEST = """
+        import time
+
+        import pytest
+        from flask import Flask, jsonify
+
+        @pytest.fixture(scope='session')
+        def app():
+            app = Flask(__name__)
+            state = {'probes': 0, 'warmed': [], 'ready_at': None}
+
+            @app.route('/health')
+            def health():
+                state['probes'] += 1
+                if state['ready_at'] is None:
+                    state['ready_at'] = time.time() + 0.2
+                if time.time() < state['ready_at']:
+                    return 'starting', 503
+                return 'ok'
+
+            @app.route('/down')
+            def down():
+                return 'down', 503
+
+            @app.route('/warm/<name>')
+            def warm(name):
+                state['warmed'].append(name)
+                return 'warm'
+
+            @app.route('/state')
+            def get_state():
+                return jsonify(state)
+
+            return app
+    """
+
+    TEST_MODULE = """
+        import json
+        from urllib.request import urlopen
+
+        def test_ready(live_server):
+            state = json.load(urlopen(live_server.url('/state')))
+            assert 1 < state['probes'] < 30
+            assert state['warmed'] == ['a', 'b']
+    """
+
+    def test_health_url_and_warmup(self, appdir):
+        appdir.create_test_module(self.CONFTEST, filename="conftest.py")
+        appdir.create_test_module(self.TEST_MODULE)
+        result = appdir.runpytest(
+            "--live-server-health-url=/health",
+            "--live-server-warmup=/warm/a",
+            "--live-server-warmup=/warm/b",
+        )
+        result.assert_outcomes(passed=1)
+
+    def test_health_url_timeout(self, appdir):
+        appdir.create_test_module(self.CONFTEST, filename="conftest.py")
+        appdir.create_test_module(self.TEST_MODULE)
+        result = appdir.runpytest(
+            "--live-server-health-url=/down", "--live-server-wait=0.5"
+        )
+        result.stdout.fnmatch_lines(
+            ["*Failed to start the server after 0.5 seconds (GET /down: 503).*"]
+        )
+
+    def test_warmup_error(self, appdir):
+        appdir.create_test_module(self.CONFTEST, filename="conftest.py")
+        appdir.create_test_module(self.TEST_MODULE)
+        result = appdir.runpytest("--live-server-warmup=/down")
+        result.stdout.fnmatch_lines(["*Failed to warm up the server: GET /down: 503.*"])
+
+
+class TestLiveServerReuse:
+    CONFTEST = """
+        import pytest
+        from flask import Flask
+
+        @pytest.fixture(scope='session')
+        def app():
+            app = Flask(__name__)
+
+            @app.route('/')
+            def index():
+                return {body!r}
+
+            return app
+    """
+
+    TEST_MODULE = """
+        from urllib.request import urlopen
+
+        def test_a(live_server):
+            body = urlopen(live_server.url('/')).read().decode()
+            print('server', live_server.pid, live_server.reused, body)
+    """
+
+    @pytest.fixture(autouse=True)
+    def kill_reused_servers(self, appdir):
+        yield
+        for path in appdir.tmpdir.visit("live_server-*.json"):
+            state = json.loads(path.read())
+            if _pid_exists(state["pid"]):
+                os.kill(state["pid"], signal.SIGKILL)
+
+    def _run(self, appdir):
+        result = appdir.runpytest("-rP", "--live-server-reuse")
+        result.assert_outcomes(passed=1)
+        (line,) = [line for line in result.outlines if line.startswith("server")]
+        _, pid, reused, body = line.split()
+        return int(pid), reused == "True", body
+
+    def test_reuse_server(self, appdir):
+        appdir.create_test_module(
+            self.CONFTEST.format(body="v1"), filename="conftest.py"
+        )
+        appdir.create_test_module(self.TEST_MODULE)
+        pid, reused, body = self._run(appdir)
+        assert not reused
+        assert body == "v1"
+        assert _pid_exists(pid)
+
+        assert self._run(appdir) == (pid, True, "v1")
+
+    def test_restart_on_source_change(self, appdir):
+        appdir.create_test_module(
+            self.CONFTEST.format(body="v1"), filename="conftest.py"
+        )
+        appdir.create_test_module(self.TEST_MODULE)
+        pid, _, _ = self._run(appdir)
+        appdir.create_test_module(
+            self.CONFTEST.format(body="v2"), filename="conftest.py"
+        )
+        new_pid, reused, body = self._run(appdir)
+        assert (reused, body) == (False, "v2")
+        assert new_pid != pid
+        assert not _pid_exists(pid)
+
+    def test_restart_on_helper_change(self, appdir):
+        appdir.create_test_module(
+            """
+            import pytest
+            from flask import Flask
+
+            import helpers
+
+            @pytest.fixture(scope='session')
+            def app():
+                app = Flask(__name__)
+
+                @app.route('/')
+                def index():
+                    return helpers.body()
+
+                return app
+        """,
+            filename="conftest.py",
+        )
+        appdir.create_test_module(
+            "def body():\n    return 'v1'\n", filename="helpers.py"
+        )
+        appdir.create_test_module(self.TEST_MODULE)
+        pid, _, _ = self._run(appdir)
+        appdir.create_test_module(
+            "def body():\n    return 'v2'\n", filename="helpers.py"
+        )
+        new_pid, reused, body = self._run(appdir)
+        assert (reused, body) == (False, "v2")
+        assert new_pid != pid
+
+    def test_restart_on_config_change(self, appdir, monkeypatch):
+        appdir.create_test_module(
+            """
+            import os
+
+            import pytest
+            from flask import Flask
+
+            @pytest.fixture(scope='session')
+            def app():
+                app = Flask(__name__)
+                app.config['BODY'] = os.environ['BODY']
+
+                @app.route('/')
+                def index():
+                    return app.config['BODY']
+
+                return app
+        """,
+            filename="conftest.py",
+        )
+        appdir.create_test_module(self.TEST_MODULE)
+        monkeypatch.setenv("BODY", "v1")
+        pid, _, _ = self._run(appdir)
+        assert self._run(appdir) == (pid, True, "v1")
+        monkeypatch.setenv("BODY", "v2")
+        new_pid, reused, body = self._run(appdir)
+        assert (reused, body) == (False, "v2")
+        assert new_pid != pid
+
+    def test_stop_when_reuse_file_is_deleted(self, appdir):
+        appdir.create_test_module(
+            self.CONFTEST.format(body="v1"), filename="conftest.py"
+        )
+        appdir.create_test_module(self.TEST_MODULE)
+        pid, _, _ = self._run(appdir)
+        for path in appdir.tmpdir.visit("live_server-*.json"):
+            path.remove()
+        deadline = time.time() + 5
+        while _pid_exists(pid) and time.time() < deadline:
+            time.sleep(0.05)
+        assert not _pid_exists(pid)
+
+    def test_incompatible_options(self, appdir):
+        appdir.create_test_module(
+            self.CONFTEST.format(body="v1"), filename="conftest.py"
+        )
+        appdir.create_test_module(self.TEST_MODULE)
+        result = appdir.runpytest(
+            "--live-server-reuse", "--live-server-access-log=capture"
+        )
+        result.stdout.fnmatch_lines(["*can't be combined with*"])
+
+
+class TestLiveServerShared:
+    def test_shared_between_workers(self, appdir):
+        pytest.importorskip("xdist")
+        appdir.create_test_module(
+            """
+            import os
+
+            import pytest
+
+            @pytest.mark.parametrize('i', range(8))
+            def test_pid(live_server, i):
+                name = os.environ['PYTEST_XDIST_WORKER']
+                with open(os.path.join({!r}, name + '-' + str(i)), 'w') as f:
+                    f.write(str(live_server.pid))
+        """.format(
+                str(appdir.tmpdir)
+            )
+        )
+        result = appdir.runpytest_subprocess("-n", "2", "--live-server-shared")
+        result.assert_outcomes(passed=8)
+        pids = {path.read() for path in appdir.tmpdir.listdir("gw*")}
+        workers = {path.basename.split("-")[0] for path in appdir.tmpdir.listdir("gw*")}
+        assert len(workers) == 2
+        (pid,) = pids
+        deadline = time.time() + 5
+        while _pid_exists(int(pid)) and time.time() < deadline:
+            time.sleep(0.05)
+        assert not _pid_exists(int(pid))
+
+
+class TestLiveServerSummary:
+    TEST_MODULE = """
+        import pytest
+
+        @pytest.mark.parametrize('i', range(3))
+        def test_server(live_server, i):
+            assert live_server.start_duration > 0
+    """
+
+    def test_summary(self, appdir):
+        appdir.create_test_module(self.TEST_MODULE)
+        result = appdir.runpytest(
+            "--live-server-summary", "-o", "live_server_scope=function"
+        )
+        result.assert_outcomes(passed=3)
+        result.stdout.fnmatch_lines(
+            [
+                "*= live servers =*",
+                "3 live servers on 1 worker, 0 reused, 0 failed to start",
+                "start: total *s, mean *s, max *s",
+                "stop:  total *s, mean *s, max *s",
+                "per scope: function 3",
+                "",
+                "*s *s function main   conftest (http://localhost:*)",
+            ]
+        )
+
+    def test_failure(self, appdir):
+        appdir.create_test_module(self.TEST_MODULE)
+        result = appdir.runpytest(
+            "--live-server-summary",
+            "--live-server-health-url=/missing",
+            "--live-server-wait=0.3",
+        )
+        result.assert_outcomes(passed=0, errors=3)
+        result.stdout.fnmatch_lines(
+            [
+                "1 live servers on 1 worker, 0 reused, 1 failed to start",
+                "*- session *main *conftest (*) FAILED: "
+                "Failed to start the server after 0.3 seconds (GET /missing: 404).",
+            ]
+        )
+
+    def test_json_across_workers(self, appdir):
+        appdir.create_test_module(self.TEST_MODULE)
+        pytest.importorskip("xdist")
+        result = appdir.runpytest_subprocess(
+            "-n",
+            "2",
+            "-o",
+            "live_server_scope=function",
+            "--live-server-summary-json=servers.json",
+        )
+        result.assert_outcomes(passed=3)
+        with open(os.path.join(str(appdir.tmpdir), "servers.json")) as f:
+            records = json.load(f)["live_servers"]
+        assert len(records) == 3
+        assert {record["worker"] for record in records} <= {"gw0", "gw1"}
+        for record in records:
+            assert record["scope"] == "function"
+            assert record["start"] > 0
+            assert record["stop"] >= 0
+            assert record["failure"] is None
+
+
+class TestLiveServerAdaptiveWait:
+    def test_adaptive_wait(self, appdir):
+        appdir.create_test_module(
+            """
+            import pytest
+
+            @pytest.mark.parametrize('i', range(5))
+            def test_server(live_server, i):
+                pass
+
+            def test_wait(request, live_server):
+                history = request.config.cache.get(
+                    'pytest_flask/live_server_startup', {}
+                )
+                if len(history.get('conftest:dev', [])) >= 5:
+                    assert live_server.wait == 1.0
+                else:
+                    assert live_server.wait == 30
+            """
+        )
+        args = (
+            "-o",
+            "live_server_scope=function",
+            "--live-server-adaptive-wait",
+            "--live-server-wait=30",
+        )
+        appdir.runpytest(*args).assert_outcomes(passed=6)
+        appdir.runpytest(*args).assert_outcomes(passed=6)
+
+        # A server which never gets ready fails quickly
+        start = time.time()
+        result = appdir.runpytest(*args, "--live-server-health-url=/down", "-x")
+        result.stdout.fnmatch_lines(
+            ["*Failed to start the server after 1.0 seconds (GET /down: 404).*"]
+        )
+        assert time.time() - start < 10
+
+    def test_adaptive_wait_xdist(self, appdir):
+        pytest.importorskip("xdist")
+        appdir.create_test_module(
+            """
+            import pytest
+
+            @pytest.mark.parametrize('i', range(4))
+            def test_server(live_server, i):
+                pass
+            """
+        )
+        appdir.create_test_module(
+            """
+            import time
+
+            import pytest
+            from flask import Flask
+
+            @pytest.fixture(scope='session')
+            def app():
+                return Flask(__name__)
+
+            def pytest_configure(config):
+                # Widen the window in which a worker could overwrite the
+                # startup durations written by the other
+                if hasattr(config, 'workerinput'):
+                    cache_set = config.cache.set
+
+                    def set(key, value):
+                        if key == 'pytest_flask/live_server_startup':
+                            time.sleep(1)
+                        cache_set(key, value)
+
+                    config.cache.set = set
+            """,
+            filename="conftest.py",
+        )
+        result = appdir.runpytest_subprocess(
+            "-n", "2", "-o", "live_server_scope=function", "--live-server-adaptive-wait"
+        )
+        result.assert_outcomes(passed=4)
+        path = appdir.tmpdir.join(
+            ".pytest_cache", "v", "pytest_flask", "live_server_startup"
+        )
+        history = json.loads(path.read())
+        assert len(history["conftest:dev"]) == 4
+
+    def test_static_wait_without_history(self, appdir):
+        appdir.create_test_module(
+            """
+            def test_wait(live_server):
+                assert live_server.wait == 7
+            """
+        )
+        result = appdir.runpytest("--live-server-adaptive-wait", "--live-server-wait=7")
+        result.assert_outcomes(passed=1)
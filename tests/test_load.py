@@ -0,0 +1,68 @@
+import math
+import os
+
+import pytest
+
+from pytest_flask.load import LoadReport
+
+
+class TestLoadReport:
+    def test_statistics(self):
+        report = LoadReport(
+            [0.004, 0.001, 0.003, 0.002], {200: 3, 500: 1}, failures=1, duration=2
+        )
+        assert report.requests == 5
+        assert report.errors == 2
+        assert report.error_rate == 0.4
+        assert report.throughput == 2
+        assert report.percentile(50) == 0.002
+        assert report.percentile(100) == 0.004
+
+    def test_histogram(self):
+        report = LoadReport([0.0005, 0.002, 0.003, 2.0], {200: 4}, 0, 1)
+        assert report.histogram([0.001, 0.01]) == [
+            (0.001, 1),
+            (0.01, 2),
+            (math.inf, 1),
+        ]
+
+    def test_empty_report(self):
+        report = LoadReport([], {}, 0, 0)
+        assert report.throughput == 0
+        assert report.error_rate == 0
+        assert math.isnan(report.percentile(99))
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+class TestLiveLoad:
+    @pytest.mark.parametrize("model", ["closed", "open"])
+    def test_run(self, appdir, model):
+        appdir.create_test_module(
+            """
+            def test_load(live_load):
+                report = live_load.run(
+                    '/missing', concurrency=2, duration=0.2, rps=50, model='%s'
+                )
+                assert report.statuses == {404: report.requests}
+                assert 5 <= report.requests <= 11
+                assert report.errors == 0
+                assert len(report.latencies) == report.requests
+        """
+            % model
+        )
+        result = appdir.runpytest("-v")
+        result.stdout.fnmatch_lines(["*1 passed*"])
+        assert result.ret == 0
+
+    def test_open_model_requires_rps(self, appdir):
+        appdir.create_test_module(
+            """
+            import pytest
+
+            def test_load(live_load):
+                with pytest.raises(ValueError, match='requires'):
+                    live_load.run(model='open')
+        """
+        )
+        result = appdir.runpytest("-v")
+        result.stdout.fnmatch_lines(["*1 passed*"])
@@ -0,0 +1,111 @@
+import pytest
+from flask import Flask
+from flask import request
+from flask import url_for
+
+from pytest_flask.negotiation import AcceptMatrix
+
+
+class TestAcceptMatrix:
+    @pytest.fixture
+    def app(self):
+        app = Flask(__name__)
+
+        @app.route("/negotiate", methods=["POST"])
+        def negotiate():
+            return "{} {} {}".format(
+                request.headers["Accept"],
+                request.headers["Accept-Charset"],
+                request.get_data(as_text=True),
+            )
+
+        return app
+
+    def test_default_matrix(self, accept_matrix):
+        assert list(accept_matrix) == [
+            [("Accept", "application/json")],
+            [("Accept", "text/html")],
+        ]
+
+    @pytest.mark.accept_matrix(
+        mimetypes=["application/json", "text/html"],
+        charsets=["utf-8", "latin-1"],
+        encodings=["gzip"],
+    )
+    def test_matrix_from_marker(self, accept_matrix):
+        assert len(accept_matrix) == 4
+        assert [
+            ("Accept", "text/html"),
+            ("Accept-Charset", "latin-1"),
+            ("Accept-Encoding", "gzip"),
+        ] in list(accept_matrix)
+
+    def test_matrix_is_generated_once(self):
+        first = AcceptMatrix(["application/json"], ["utf-8"])
+        second = AcceptMatrix(["application/json"], ["utf-8"])
+        assert first.headers is second.headers
+
+    @pytest.mark.accept_matrix(
+        mimetypes=["application/json", "text/html"], charsets=["utf-8"]
+    )
+    def test_run_view_across_matrix(self, client, accept_matrix):
+        results = accept_matrix.run(
+            client, url_for("negotiate"), method="POST", data="body"
+        )
+        assert [res.data for _, res in results] == [
+            b"application/json utf-8 body",
+            b"text/html utf-8 body",
+        ]
+        assert all(res == 200 for _, res in results)
+
+    def test_accept_headers_parametrization(self, appdir):
+        appdir.create_test_module(
+            """
+            import pytest
+
+            @pytest.mark.accept_matrix(
+                mimetypes=['application/json', 'text/html'],
+                encodings=['gzip', 'identity'],
+            )
+            def test_a(accept_headers):
+                assert len(accept_headers) == 2
+        """
+        )
+        result = appdir.runpytest("-v")
+        result.stdout.fnmatch_lines(
+            [
+                "*test_a?application/json-gzip? PASSED*",
+                "*test_a?text/html-identity? PASSED*",
+            ]
+        )
+        result.assert_outcomes(passed=4)
+
+    def test_accept_headers_default(self, appdir):
+        appdir.create_test_module(
+            """
+            def test_a(accept_headers):
+                assert accept_headers[0][0] == 'Accept'
+        """
+        )
+        result = appdir.runpytest("-v")
+        result.stdout.fnmatch_lines(
+            ["*test_a?application/json? PASSED*", "*test_a?text/html? PASSED*"]
+        )
+        result.assert_outcomes(passed=2)
+
+    def test_accept_headers_user_fixture(self, appdir):
+        appdir.create_test_module(
+            """
+            import pytest
+
+            @pytest.fixture
+            def accept_headers():
+                return {'Accept': 'application/xml'}
+
+            def test_x(accept_headers):
+                assert accept_headers == {'Accept': 'application/xml'}
+        """
+        )
+        result = appdir.runpytest("-v")
+        result.stdout.fnmatch_lines(["*test_x PASSED*"])
+        result.assert_outcomes(passed=1)
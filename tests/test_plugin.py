@@ -0,0 +1,45 @@
+import subprocess
+import sys
+from textwrap import dedent
+
+
+class TestPluginImport:
+    def test_plugin_does_not_import_flask(self):
+        """Importing the plugin entry point must stay cheap for pytest
+        sessions which don't use any Flask fixture."""
+        code = dedent(
+            """
+            import sys
+            import time
+
+            import pytest
+
+            start = time.perf_counter()
+            import pytest_flask.plugin
+            elapsed = time.perf_counter() - start
+
+            heavy = ['flask', 'werkzeug', 'multiprocessing', 'concurrent.futures']
+            print([name for name in heavy if name in sys.modules])
+            print('import time: %.1f ms' % (elapsed * 1000))
+        """
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code],
+            check=True,
+            stdout=subprocess.PIPE,
+            universal_newlines=True,
+        ).stdout
+        imported, import_time = output.splitlines()
+        assert imported == "[]", import_time
+
+    def test_fixtures_without_flask_fixture(self, testdir):
+        testdir.makepyfile(
+            """
+            import sys
+
+            def test_a():
+                assert 'flask' not in sys.modules
+        """
+        )
+        result = testdir.runpytest_subprocess("-p", "no:cacheprovider")
+        result.assert_outcomes(passed=1)
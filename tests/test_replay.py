@@ -0,0 +1,165 @@
+import time
+
+import pytest
+
+
+CONFTEST = """
+    import os
+
+    import pytest
+
+    from flask import Flask, jsonify, request
+
+    @pytest.fixture(scope='session')
+    def app():
+        app = Flask(__name__)
+        app.calls = 0
+
+        @app.route('/expensive', methods=['GET', 'POST'])
+        def expensive():
+            app.calls += 1
+            return jsonify(
+                body=request.get_data(as_text=True),
+                version=os.environ.get('APP_VERSION', '1'),
+            )
+
+        return app
+"""
+
+TEST_MODULE = """
+    import pytest
+
+    pytestmark = pytest.mark.replay
+
+    def test_get(app, client):
+        res = client.get('/expensive')
+        assert res == 200
+        assert res.json['body'] == ''
+        assert client.post('/expensive', data='a').json['body'] == 'a'
+        assert client.post('/expensive', data='b').json['body'] == 'b'
+        print('calls:', app.calls)
+"""
+
+
+class TestReplay:
+    def test_replay_recorded_responses(self, appdir):
+        appdir.create_test_module(CONFTEST, filename="conftest.py")
+        appdir.create_test_module(TEST_MODULE)
+        result = appdir.runpytest("-s", "--flask-replay=on")
+        result.stdout.fnmatch_lines(["*calls: 3", "*1 passed*"])
+
+        result = appdir.runpytest("-s", "--flask-replay=on")
+        result.stdout.fnmatch_lines(["*calls: 0", "*1 passed*"])
+
+    def test_replay_disabled_by_default(self, appdir):
+        appdir.create_test_module(CONFTEST, filename="conftest.py")
+        appdir.create_test_module(TEST_MODULE)
+        appdir.runpytest("--flask-replay=on")
+        result = appdir.runpytest("-s")
+        result.stdout.fnmatch_lines(["*calls: 3", "*1 passed*"])
+
+    def test_replay_key_includes_config(self, appdir):
+        appdir.create_test_module(CONFTEST, filename="conftest.py")
+        appdir.create_test_module(TEST_MODULE)
+        appdir.runpytest("--flask-replay=on")
+        appdir.create_test_module(
+            """
+            import pytest
+
+            @pytest.mark.replay
+            @pytest.mark.options(foo='bar')
+            def test_get(app, client):
+                client.get('/expensive')
+                print('calls:', app.calls)
+        """,
+            filename="test_options.py",
+        )
+        result = appdir.runpytest("-s", "--flask-replay=on", "-k", "options")
+        result.stdout.fnmatch_lines(["*calls: 1", "*1 passed*"])
+
+    def test_verify(self, appdir, monkeypatch):
+        appdir.create_test_module(CONFTEST, filename="conftest.py")
+        appdir.create_test_module(TEST_MODULE)
+        appdir.runpytest("--flask-replay=on")
+        result = appdir.runpytest("-s", "--flask-replay=verify")
+        result.stdout.fnmatch_lines(["*calls: 3", "*1 passed*"])
+
+        monkeypatch.setenv("APP_VERSION", "2")
+        result = appdir.runpytest("--flask-replay=verify")
+        result.stdout.fnmatch_lines(
+            ["*Response of GET /expensive? differs from the recorded one*"]
+        )
+        assert result.ret == 1
+
+    def test_replay_cookies(self, appdir):
+        appdir.create_test_module(CONFTEST, filename="conftest.py")
+        appdir.create_test_module(TEST_MODULE)
+        appdir.create_test_module(
+            """
+            import pytest
+            from flask import redirect, request
+
+            @pytest.fixture(scope='session')
+            def app(app):
+                @app.route('/me')
+                def me():
+                    app.calls += 1
+                    return request.cookies.get('user', 'anonymous')
+
+                @app.route('/login')
+                def login():
+                    app.calls += 1
+                    response = redirect('/me')
+                    response.set_cookie('user', 'alice')
+                    return response
+
+                return app
+
+            @pytest.mark.replay
+            def test_login(app, client):
+                assert client.get('/me').data == b'anonymous'
+                assert client.get('/login', follow_redirects=True).data == b'alice'
+                assert client.get('/me').data == b'alice'
+                assert client.get_cookie('user').value == 'alice'
+                print('calls:', app.calls)
+        """,
+            filename="test_login.py",
+        )
+        result = appdir.runpytest("-s", "--flask-replay=on", "-k", "login")
+        result.stdout.fnmatch_lines(["*calls: 4", "*1 passed*"])
+
+        result = appdir.runpytest("-s", "--flask-replay=on", "-k", "login")
+        result.stdout.fnmatch_lines(["*calls: 0", "*1 passed*"])
+
+    def test_verify_session_cookie(self, appdir):
+        appdir.create_test_module(CONFTEST, filename="conftest.py")
+        appdir.create_test_module(
+            """
+            import pytest
+            from flask import session
+
+            @pytest.fixture(scope='session')
+            def app(app):
+                app.secret_key = 'secret'
+
+                @app.route('/login')
+                def login():
+                    session['user'] = 'alice'
+                    return 'ok'
+
+                return app
+
+            @pytest.mark.replay
+            def test_login(client):
+                assert client.get('/login').data == b'ok'
+                print('cookie:', client.get_cookie('session').value)
+        """
+        )
+        result = appdir.runpytest("-s", "--flask-replay=on")
+        result.assert_outcomes(passed=1)
+        (recorded,) = [line for line in result.outlines if "cookie:" in line]
+        time.sleep(1)
+        result = appdir.runpytest("-s", "--flask-replay=verify")
+        result.assert_outcomes(passed=1)
+        (verified,) = [line for line in result.outlines if "cookie:" in line]
+        assert verified != recorded
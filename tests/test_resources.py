@@ -0,0 +1,117 @@
+import os
+import sys
+
+import pytest
+
+from pytest_flask.resources import ResourceUsage
+from pytest_flask.resources import sample_process
+
+
+needs_proc = pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="needs /proc"
+)
+
+
+class TestResourceUsage:
+    def test_since(self):
+        before = ResourceUsage(1.0, 1000, 5, 2)
+        after = ResourceUsage(1.5, 3000, 7, 2)
+        assert after.since(before) == ResourceUsage(0.5, 2000, 2, 0)
+
+    @needs_proc
+    def test_sample_current_process(self):
+        usage = sample_process(os.getpid())
+        assert usage.rss > 0
+        assert usage.fds > 0
+        assert usage.threads >= 1
+
+    def test_sample_missing_process(self):
+        assert sample_process(-1) is None
+
+
+@needs_proc
+class TestLiveServerResources:
+    def test_usage_by_test(self, appdir):
+        appdir.create_test_module(
+            """
+            def test_a(live_server):
+                assert live_server.start_usage.fds > 0
+                assert live_server.resource_usage().threads >= 1
+
+            def test_b(live_server, request):
+                assert 'test_app.py::test_a' in ''.join(live_server.usage_by_test)
+        """
+        )
+        result = appdir.runpytest("-v", "--live-server-resources")
+        result.stdout.fnmatch_lines(
+            [
+                "*live server resource usage*",
+                "http://localhost:*",
+                "  started: cpu *s, rss * MiB, * fds, * threads",
+                "  stopped: *",
+                "  growth:  *",
+                "*2 passed*",
+            ]
+        )
+        assert result.ret == 0
+
+    def test_xdist(self, appdir):
+        pytest.importorskip("xdist")
+        appdir.create_test_module(
+            """
+            def test_a(live_server):
+                pass
+
+            def test_b(live_server):
+                pass
+        """
+        )
+        result = appdir.runpytest_subprocess(
+            "-n", "2", "-o", "live_server_scope=function", "--live-server-resources"
+        )
+        result.assert_outcomes(passed=2)
+        result.stdout.fnmatch_lines(
+            [
+                "*live server resource usage*",
+                "http://localhost:*",
+                "  started: cpu *s, rss * MiB, * fds, * threads",
+                "  stopped: *",
+                "  growth:  *",
+                "  largest RSS growth: tests/test_app.py::test_? (* bytes)",
+            ]
+        )
+        assert result.stdout.str().count("  started: ") == 2
+
+    def test_max_fd_growth(self, appdir):
+        appdir.create_test_module(
+            """
+            from urllib.request import urlopen
+
+            def test_leak(live_server):
+                urlopen(live_server.url('/leak')).read()
+        """
+        )
+        appdir.create_test_module(
+            """
+            import pytest
+
+            from flask import Flask
+
+            @pytest.fixture(scope='session')
+            def app():
+                app = Flask(__name__)
+
+                @app.route('/leak')
+                def leak():
+                    leak.files = [open(__file__) for _ in range(5)]
+                    return 'leaked'
+
+                return app
+        """,
+            filename="conftest.py",
+        )
+        result = appdir.runpytest("-v", "--live-server-max-fd-growth=2")
+        result.stdout.fnmatch_lines(
+            ["*open file descriptors grew by * during the test (limit 2)*"]
+        )
+        assert result.ret == 1
@@ -0,0 +1,167 @@
+import pytest
+
+from pytest_flask.selection import _source_hash
+
+CONFTEST = """
+    import pytest
+
+    from flask import Flask
+
+    @pytest.fixture(scope='session')
+    def app():
+        app = Flask(__name__)
+
+        @app.route('/a')
+        def view_a():
+            return {a}
+
+        @app.route('/b')
+        def view_b():
+            return 'b'
+
+        return app
+"""
+
+TEST_MODULE = """
+    def test_a(client):
+        assert client.get('/a') == 200
+
+    def test_b(client):
+        assert client.get('/b') == 200
+
+    def test_without_requests(client):
+        pass
+
+    def test_without_client():
+        pass
+"""
+
+
+class TestChangedViews:
+    def test_first_run_selects_everything(self, appdir):
+        appdir.create_test_module(CONFTEST.format(a="'a'"), filename="conftest.py")
+        appdir.create_test_module(TEST_MODULE)
+        result = appdir.runpytest("--flask-changed")
+        result.assert_outcomes(passed=4)
+
+    def test_unchanged_views_are_deselected(self, appdir):
+        appdir.create_test_module(CONFTEST.format(a="'a'"), filename="conftest.py")
+        appdir.create_test_module(TEST_MODULE)
+        appdir.runpytest("--flask-changed")
+        result = appdir.runpytest("--flask-changed", "-v")
+        result.stdout.fnmatch_lines(
+            ["*test_without_requests PASSED*", "*test_without_client PASSED*"]
+        )
+        result.assert_outcomes(passed=2, deselected=2)
+
+    def test_changed_view_is_selected(self, appdir):
+        appdir.create_test_module(CONFTEST.format(a="'a'"), filename="conftest.py")
+        appdir.create_test_module(TEST_MODULE)
+        appdir.runpytest("--flask-changed")
+        appdir.create_test_module(CONFTEST.format(a="'A'"), filename="conftest.py")
+        result = appdir.runpytest("--flask-changed", "-v")
+        result.stdout.fnmatch_lines(["*test_a PASSED*"])
+        result.assert_outcomes(passed=3, deselected=1)
+
+    def test_formatting_changes_are_ignored(self, appdir):
+        appdir.create_test_module(CONFTEST.format(a="'a'"), filename="conftest.py")
+        appdir.create_test_module(TEST_MODULE)
+        appdir.runpytest("--flask-changed")
+        appdir.create_test_module(
+            "\n\n    # moved\n" + CONFTEST.format(a='"a"'), filename="conftest.py"
+        )
+        result = appdir.runpytest("--flask-changed")
+        result.assert_outcomes(passed=2, deselected=2)
+
+    def test_changed_test_module_is_selected(self, appdir):
+        appdir.create_test_module(CONFTEST.format(a="'a'"), filename="conftest.py")
+        appdir.create_test_module(TEST_MODULE)
+        appdir.runpytest("--flask-changed")
+        appdir.create_test_module(
+            """
+            def test_a(client):
+                assert client.get('/a').data == b'a'
+
+            def test_b(client):
+                assert client.get('/b') == 200
+        """
+        )
+        result = appdir.runpytest("--flask-changed")
+        result.assert_outcomes(passed=2)
+
+    def test_requests_without_view_run_again(self, appdir):
+        appdir.create_test_module(CONFTEST.format(a="'a'"), filename="conftest.py")
+        appdir.create_test_module(TEST_MODULE)
+        appdir.create_test_module(
+            """
+            def test_missing(client):
+                assert client.get('/missing') == 404
+
+            def test_a_and_missing(client):
+                assert client.get('/a') == 200
+                assert client.get('/missing') == 404
+        """
+        )
+        appdir.runpytest("--flask-changed")
+        result = appdir.runpytest("--flask-changed")
+        result.assert_outcomes(passed=2)
+
+    def test_failed_tests_run_again(self, appdir):
+        appdir.create_test_module(CONFTEST.format(a="'a'"), filename="conftest.py")
+        appdir.create_test_module(TEST_MODULE)
+        appdir.create_test_module(
+            """
+            def test_a(client):
+                assert client.get('/a').data == b'A'
+        """
+        )
+        appdir.runpytest("--flask-changed")
+        result = appdir.runpytest("--flask-changed")
+        result.assert_outcomes(failed=1)
+
+    def test_live_server_requests_are_recorded(self, appdir):
+        appdir.create_test_module(CONFTEST.format(a="'a'"), filename="conftest.py")
+        appdir.create_test_module(TEST_MODULE)
+        appdir.create_test_module(
+            """
+            from urllib.request import urlopen
+
+            def test_live_a(live_server):
+                assert urlopen(live_server.url('/a')).read() == b'a'
+        """
+        )
+        args = ("--flask-changed", "--live-server-access-log=capture")
+        appdir.runpytest(*args)
+        result = appdir.runpytest(*args)
+        result.assert_outcomes(deselected=1)
+
+        appdir.create_test_module(CONFTEST.format(a="'a' + ''"), filename="conftest.py")
+        result = appdir.runpytest(*args)
+        result.assert_outcomes(passed=1)
+
+    def test_xdist(self, appdir):
+        appdir.create_test_module(CONFTEST.format(a="'a'"), filename="conftest.py")
+        appdir.create_test_module(TEST_MODULE)
+        pytest.importorskip("xdist")
+        appdir.runpytest_subprocess("-n", "2", "--flask-changed")
+        result = appdir.runpytest_subprocess("-n", "2", "--flask-changed")
+        result.assert_outcomes(passed=2)
+
+        appdir.create_test_module(CONFTEST.format(a="'A'"), filename="conftest.py")
+        result = appdir.runpytest_subprocess("-n", "2", "--flask-changed")
+        result.assert_outcomes(passed=3)
+
+    def test_disabled_by_default(self, appdir):
+        appdir.create_test_module(CONFTEST.format(a="'a'"), filename="conftest.py")
+        appdir.create_test_module(TEST_MODULE)
+        appdir.runpytest("--flask-changed")
+        result = appdir.runpytest()
+        result.assert_outcomes(passed=4)
+
+
+def test_source_hash_of_nested_function(tmp_path):
+    module = tmp_path / "views.py"
+    module.write_text("def factory():\n    def view():\n        return 1\n")
+    digest = _source_hash(str(module), "factory.<locals>.view")
+    assert digest is not None
+    assert _source_hash(str(module), "factory.<locals>.missing") is None
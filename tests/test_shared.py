@@ -0,0 +1,98 @@
+import hashlib
+import multiprocessing
+import os
+import pickle
+
+import pytest
+
+
+def _digest(dataset):
+    return hashlib.sha256(dataset.buffer).hexdigest()
+
+
+class TestSharedDatasets:
+    def test_add(self, shared_datasets):
+        dataset = shared_datasets.add("test_add", b"abc" * 1000)
+        assert len(dataset) == 3000
+        assert dataset.buffer.readonly
+        assert bytes(dataset.buffer[:6]) == b"abcabc"
+        assert shared_datasets.add("test_add", b"other") is dataset
+        assert shared_datasets["test_add"] is dataset
+        with pytest.raises(TypeError):
+            dataset.buffer[0] = 1
+
+    def test_add_file(self, shared_datasets, tmp_path):
+        path = tmp_path / "data.bin"
+        path.write_bytes(b"0123456789")
+        dataset = shared_datasets.add_file("test_add_file", path)
+        assert bytes(dataset.buffer) == b"0123456789"
+        assert dataset.buffer.readonly
+        assert "test_add_file" in shared_datasets
+
+    def test_pickle_attaches(self, shared_datasets):
+        dataset = shared_datasets.add("test_pickle", bytes(range(256)))
+        attached = pickle.loads(pickle.dumps(dataset))
+        assert bytes(attached.buffer) == bytes(range(256))
+        attached.close()
+        # Closing the attached dataset doesn't destroy the shared memory
+        attached = pickle.loads(pickle.dumps(dataset))
+        assert bytes(attached.buffer[:3]) == b"\0\1\2"
+        attached.close()
+
+    def test_spawned_process(self, shared_datasets, tmp_path):
+        data = os.urandom(1024 * 1024)
+        path = tmp_path / "data.bin"
+        path.write_bytes(data)
+        datasets = [
+            shared_datasets.add("test_spawn", data),
+            shared_datasets.add_file("test_spawn_file", path),
+        ]
+        with multiprocessing.get_context("spawn").Pool(1) as pool:
+            digests = pool.map(_digest, datasets)
+        assert digests == [hashlib.sha256(data).hexdigest()] * 2
+
+    def test_close(self, tmp_path):
+        from pytest_flask.shared import SharedDatasets
+
+        datasets = SharedDatasets()
+        dataset = datasets.add("a", b"abc")
+        datasets.close()
+        assert "a" not in datasets
+        with pytest.raises(FileNotFoundError):
+            pickle.loads(pickle.dumps(dataset))
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_live_server_reads_dataset(appdir):
+    appdir.create_test_module(
+        """
+        import hashlib
+
+        import pytest
+        from flask import Flask
+
+        @pytest.fixture(scope='session')
+        def app(shared_datasets):
+            dataset = shared_datasets.add('data', b'x' * 100000)
+            app = Flask(__name__)
+
+            @app.route('/digest')
+            def digest():
+                return hashlib.sha256(dataset.buffer).hexdigest()
+
+            return app
+    """,
+        filename="conftest.py",
+    )
+    appdir.create_test_module(
+        """
+        import hashlib
+        from urllib.request import urlopen
+
+        def test_digest(live_server):
+            body = urlopen(live_server.url('/digest')).read().decode()
+            assert body == hashlib.sha256(b'x' * 100000).hexdigest()
+    """
+    )
+    result = appdir.runpytest()
+    result.assert_outcomes(passed=1)
@@ -0,0 +1,98 @@
+import hashlib
+import tracemalloc
+
+import pytest
+from flask import Flask
+from flask import jsonify
+from flask import request
+
+MiB = 1024 * 1024
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+
+    @app.route("/upload", methods=["POST", "PUT"])
+    def upload():
+        digest = hashlib.sha256()
+        size = 0
+        for chunk in iter(lambda: request.stream.read(64 * 1024), b""):
+            digest.update(chunk)
+            size += len(chunk)
+        return jsonify(
+            size=size,
+            sha256=digest.hexdigest(),
+            content_length=request.content_length,
+        )
+
+    @app.route("/download/<int:size>")
+    def download(size):
+        def generate():
+            for _ in range(size // MiB):
+                yield b"x" * MiB
+
+        return app.response_class(generate(), mimetype="application/octet-stream")
+
+    return app
+
+
+def _chunks(count, size=MiB):
+    for i in range(count):
+        yield bytes([i % 256]) * size
+
+
+class TestStreamingClient:
+    def test_upload_from_iterable(self, streaming_client):
+        expected = hashlib.sha256(b"".join(_chunks(4))).hexdigest()
+        res = streaming_client.post("/upload", body=_chunks(4))
+        assert res == 200
+        assert res.json == {"size": 4 * MiB, "sha256": expected, "content_length": None}
+
+    def test_upload_from_path(self, streaming_client, tmp_path):
+        path = tmp_path / "upload.bin"
+        path.write_bytes(b"a" * 1000)
+        res = streaming_client.put("/upload", body=path)
+        assert res.json["size"] == 1000
+        assert res.json["content_length"] == 1000
+
+    def test_upload_from_file(self, streaming_client, tmp_path):
+        path = tmp_path / "upload.bin"
+        path.write_bytes(b"abcdef")
+        with open(path, "rb") as f:
+            f.read(2)
+            res = streaming_client.post("/upload", body=f)
+        assert res.json["size"] == res.json["content_length"] == 4
+
+    def test_upload_memory_is_bounded(self, streaming_client):
+        tracemalloc.start()
+        try:
+            res = streaming_client.post("/upload", body=_chunks(64, 256 * 1024))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert res.json["size"] == 16 * MiB
+        assert peak < 8 * MiB
+
+    def test_spooled_response(self, streaming_client):
+        res = streaming_client.get("/download/{}".format(3 * MiB))
+        assert res == 200
+        assert len(res.body) == 3 * MiB
+        assert res.body.mmap()[-2:] == b"xx"
+        assert sum(len(chunk) for chunk in res.body) == 3 * MiB
+        assert res.data == b"x" * 3 * MiB
+
+    def test_download_memory_is_bounded(self, app, client):
+        from pytest_flask.streaming import StreamingClient
+
+        streaming_client = StreamingClient(client, spool_size=MiB)
+        tracemalloc.start()
+        try:
+            res = streaming_client.get("/download/{}".format(16 * MiB))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert len(res.body) == 16 * MiB
+        assert peak < 8 * MiB
+        streaming_client.close()
+        assert res.body.file.closed
@@ -0,0 +1,103 @@
+CONFTEST = """
+    import pytest
+    from flask import Blueprint, Flask
+
+    @pytest.fixture(scope='session')
+    def app():
+        app = Flask(__name__)
+        app.register_blueprint(
+            Blueprint('admin', __name__, template_folder='admin/templates')
+        )
+        return app
+"""
+
+
+def test_compiled_before_render(appdir):
+    appdir.create_test_module(CONFTEST, filename="conftest.py")
+    appdir.create_test_module("<h1>{{ title }}</h1>", filename="templates/index.html")
+    appdir.create_test_module(
+        "{% extends 'index.html' %}", filename="admin/templates/admin/index.html"
+    )
+    appdir.create_test_module(
+        """
+        from flask import render_template
+
+        def compiled(app):
+            return sorted(name for _, name in app.jinja_env.cache.keys())
+
+        def test_compiled(app):
+            assert compiled(app) == ['admin/index.html', 'index.html']
+            assert render_template('admin/index.html', title='hi') == '<h1>hi</h1>'
+        """
+    )
+    result = appdir.runpytest("--flask-template-cache")
+    result.assert_outcomes(passed=1)
+
+    assert len(list(appdir.tmpdir.visit("__jinja2_*.cache"))) == 2
+
+
+def test_not_compiled_by_default(appdir):
+    appdir.create_test_module(CONFTEST, filename="conftest.py")
+    appdir.create_test_module("<h1>{{ title }}</h1>", filename="templates/index.html")
+    appdir.create_test_module(
+        "{% extends 'index.html' %}", filename="admin/templates/admin/index.html"
+    )
+    appdir.create_test_module(
+        """
+        def test_not_compiled(app):
+            assert not app.jinja_env.cache
+        """
+    )
+    result = appdir.runpytest()
+    result.assert_outcomes(passed=1)
+
+
+def test_syntax_error_raised_on_render(appdir):
+    appdir.create_test_module(CONFTEST, filename="conftest.py")
+    appdir.create_test_module("<h1>{{ title }}</h1>", filename="templates/index.html")
+    appdir.create_test_module(
+        "{% extends 'index.html' %}", filename="admin/templates/admin/index.html"
+    )
+    appdir.create_test_module("{% if %}", filename="templates/broken.html")
+    appdir.create_test_module(
+        """
+        import pytest
+        from flask import render_template
+        from jinja2 import TemplateSyntaxError
+
+        def test_compiled(client):
+            assert client.get('/').status_code == 404
+
+        def test_broken(app):
+            with pytest.raises(TemplateSyntaxError):
+                render_template('broken.html')
+        """
+    )
+    result = appdir.runpytest("--flask-template-cache")
+    result.assert_outcomes(passed=2)
+
+
+def test_bytecode_reused(appdir):
+    appdir.create_test_module(CONFTEST, filename="conftest.py")
+    appdir.create_test_module("<h1>{{ title }}</h1>", filename="templates/index.html")
+    appdir.create_test_module(
+        "{% extends 'index.html' %}", filename="admin/templates/admin/index.html"
+    )
+    appdir.create_test_module(
+        """
+        from flask import render_template
+
+        def test_render(app):
+            assert render_template('index.html', title='hi') == '<h1>hi</h1>'
+        """
+    )
+    appdir.runpytest("--flask-template-cache").assert_outcomes(passed=1)
+    bytecode = next(appdir.tmpdir.visit("__jinja2_*.cache"))
+    bytecode.write_binary(b"")
+
+    # A stale cache entry is compiled again, a fresh one is loaded as is
+    appdir.runpytest("--flask-template-cache").assert_outcomes(passed=1)
+    assert bytecode.size() > 0
+    mtime = bytecode.mtime()
+    appdir.runpytest("--flask-template-cache").assert_outcomes(passed=1)
+    assert bytecode.mtime() == mtime